@@ -0,0 +1,337 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+import itertools
+import threading
+from types import SimpleNamespace
+
+import yaml
+
+from metrics import METRICS
+from mutants import CLIENTS, DISPATCHER, LOBBIES, SHOWN, Lobby, load_config
+from notify import WebhookSender
+from storage import MemoryStorage
+
+
+# stand-ins for dynamodb, the telegram bot api and discord webhooks with injected latency
+
+class FakeStorage(MemoryStorage):
+    def __init__(self, latency=0):
+        super().__init__()
+        self.latency = latency
+
+
+    def _wait(self):
+        if self.latency:
+            time.sleep(self.latency)
+
+
+    def get(self, *args, **kwargs):
+        self._wait()
+        return super().get(*args, **kwargs)
+
+
+    def put(self, *args, **kwargs):
+        self._wait()
+        return super().put(*args, **kwargs)
+
+
+    def update(self, *args, **kwargs):
+        self._wait()
+        return super().update(*args, **kwargs)
+
+
+    def join(self, *args, **kwargs):
+        self._wait()
+        return super().join(*args, **kwargs)
+
+
+    def swap(self, *args, **kwargs):
+        self._wait()
+        return super().swap(*args, **kwargs)
+
+
+class FakeTelegram:
+    def __init__(self, latency=0):
+        self.latency = latency
+        self.calls = 0
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+
+    def _call(self):
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.calls += 1
+        return SimpleNamespace(message_id=next(self._ids))
+
+
+    def send_message(self, text, chat_id, **kwargs):
+        return self._call()
+
+
+    def edit_message_text(self, text, chat_id, message_id, **kwargs):
+        return self._call()
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, body=None):
+        self.status_code = status_code
+        self.ok = status_code < 400
+        self._body = body or {}
+
+
+    def json(self):
+        return self._body
+
+
+    def raise_for_status(self):
+        if not self.ok:
+            raise RuntimeError(f'HTTP {self.status_code}')
+
+
+class FakeHttp:
+    def __init__(self, latency=0):
+        self.latency = latency
+        self.calls = 0
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+
+    def request(self, method, url, **kwargs):
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.calls += 1
+        return FakeResponse(200, {'id': str(next(self._ids))})
+
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+
+    def patch(self, url, **kwargs):
+        return self.request('PATCH', url, **kwargs)
+
+
+class FakeContext:
+    # the parts of discord_slash's ComponentContext that on_component uses
+    def __init__(self, custom_id, author):
+        self.custom_id = custom_id
+        self.author = author
+        self.replies = []
+
+
+    async def send(self, content=None, **kwargs):
+        self.replies.append(content)
+
+
+    async def defer(self, **kwargs):
+        pass
+
+
+def make_config(users=8, channels=2, webhooks=2):
+    return {
+        'T_TOKEN': 'bench',
+        'D_TOKEN': 'bench',
+        'D_SERVERS': [1],
+        'TABLE': 'bench',
+        'STORAGE': 'memory',
+        'API': 'https://bench.invalid/',
+        # measure our own code, not telegram's pacing
+        'T_RATE': 1e6,
+        'T_CHAT_RATE': 1e6,
+        'T_GROUP_RATE': 1e6,
+        'USERS': {f'user{i}#{i:04d}': {'telegram': 1000 + i} for i in range(users)},
+        'T_CHANNELS': [-1000 - i for i in range(channels)],
+        'D_WEBHOOKS': [f'https://discord.invalid/api/webhooks/{i}/bench' for i in range(webhooks)],
+    }
+
+
+def install(cfg, net_latency=0, db_latency=0):
+    CLIENTS.clear()
+    LOBBIES.clear()
+    SHOWN.clear()
+    stubs = SimpleNamespace(
+        telegram=FakeTelegram(net_latency),
+        http=FakeHttp(net_latency),
+        storage=FakeStorage(db_latency)
+    )
+    CLIENTS.set(('telegram', cfg['T_TOKEN']), stubs.telegram)
+    CLIENTS.set('webhooks', WebhookSender(lambda host: stubs.http))
+    CLIENTS.set(CLIENTS.storage_key(cfg), stubs.storage)
+    return stubs
+
+
+def write_config(raw):
+    fd, path = tempfile.mkstemp(prefix='mutants-bench-', suffix='.yml')
+    with os.fdopen(fd, 'w') as f:
+        yaml.safe_dump(raw, f)
+    os.environ['MUTANTS_CONFIG'] = path
+    return path
+
+
+class Invites:
+    # hands out (lobby, user, slot) triples, opening a new lobby when the roster is used up
+    def __init__(self, cfg):
+        self.cfg = cfg
+        self.creator = next(iter(cfg.users))
+        self._pending = []
+
+
+    def next(self):
+        if not self._pending:
+            lobby = Lobby(self.cfg).new(creator=self.creator, joined=[], max=len(self.cfg.users))
+            DISPATCHER.drain()
+            self._pending = [(lobby.lobbyId, user, slot) for slot, user in lobby.slots.items()]
+        return self._pending.pop()
+
+
+def measure(op, iterations):
+    samples = []
+    for _ in range(iterations):
+        prepared = op.prepare() if hasattr(op, 'prepare') else None
+        start = time.perf_counter()
+        op(prepared)
+        samples.append(time.perf_counter() - start)
+        # queued notifications are not part of the caller's latency, but must not pile up between ops
+        DISPATCHER.drain()
+    return samples
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def report(name, samples):
+    total = sum(samples)
+    print(f'{name:<16} {len(samples):>6} '
+          f'{percentile(samples, 50) * 1000:>9.2f} '
+          f'{percentile(samples, 95) * 1000:>9.2f} '
+          f'{percentile(samples, 99) * 1000:>9.2f} '
+          f'{len(samples) / total if total else float("inf"):>10.1f}')
+
+
+class NewOp:
+    def __init__(self, cfg):
+        self.cfg = cfg
+        self.creator = next(iter(cfg.users))
+
+
+    def __call__(self, _):
+        Lobby(self.cfg).new(creator=self.creator, joined=[], max=len(self.cfg.users))
+
+
+class JoinOp:
+    def __init__(self, cfg):
+        self.cfg = cfg
+        self.invites = Invites(cfg)
+
+
+    def prepare(self):
+        return self.invites.next()
+
+
+    def __call__(self, invite):
+        lobbyId, user, _ = invite
+        Lobby(self.cfg, lobbyId).join(user)
+
+
+class ViewOp:
+    def __init__(self, cfg):
+        self.cfg = cfg
+        self.lobbyId = Lobby(cfg).new(creator=next(iter(cfg.users)), joined=[]).lobbyId
+
+
+    def __call__(self, _):
+        return Lobby(self.cfg, self.lobbyId).joined
+
+
+class LambdaOp:
+    def __init__(self, cfg):
+        import lambda_function
+        self.handler = lambda_function.lambda_handler
+        self.invites = Invites(cfg)
+
+
+    def prepare(self):
+        lobbyId, _, slot = self.invites.next()
+        return {'headers': {'user-agent': 'bench'}, 'path': f'/{lobbyId}/{slot}/join'}
+
+
+    def __call__(self, event):
+        r = self.handler(event, None)
+        assert r['statusCode'] == 200, r
+
+
+class ComponentOp:
+    def __init__(self, cfg, action):
+        import asyncio
+        import main
+        self.loop = asyncio.new_event_loop()
+        self.handler = main.on_component
+        self.action = action
+        self.invites = Invites(cfg)
+        self.viewer = self.invites.next()
+
+
+    def prepare(self):
+        lobbyId, user, _ = self.invites.next() if self.action == 'join' else self.viewer
+        return FakeContext(f'{lobbyId}-{self.action}', user)
+
+
+    def __call__(self, ctx):
+        self.loop.run_until_complete(self.handler(ctx))
+
+
+SCENARIOS = {
+    'new': NewOp,
+    'join': JoinOp,
+    'view': ViewOp,
+    'lambda': LambdaOp,
+    'component-join': lambda cfg: ComponentOp(cfg, 'join'),
+    'component-view': lambda cfg: ComponentOp(cfg, 'view'),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark lobby create, join and view paths against local stand-ins')
+    parser.add_argument('scenarios', nargs='*', default=list(SCENARIOS), help=', '.join(SCENARIOS))
+    parser.add_argument('-n', '--iterations', type=int, default=200)
+    parser.add_argument('--users', type=int, default=8, help='size of USERS')
+    parser.add_argument('--channels', type=int, default=2, help='size of T_CHANNELS')
+    parser.add_argument('--webhooks', type=int, default=2, help='size of D_WEBHOOKS')
+    parser.add_argument('--net-latency', type=float, default=0, help='telegram/discord latency in ms')
+    parser.add_argument('--db-latency', type=float, default=0, help='storage latency in ms')
+    parser.add_argument('--stages', action='store_true', help='print per-stage latency from the metrics registry')
+    args = parser.parse_args()
+
+    # keep lambda_handler's per-invocation EMF lines out of the report
+    METRICS.flush = lambda: None
+
+    raw = make_config(args.users, args.channels, args.webhooks)
+    path = write_config(raw)
+    try:
+        cfg = load_config()
+        print(f'{"scenario":<16} {"ops":>6} {"p50 ms":>9} {"p95 ms":>9} {"p99 ms":>9} {"ops/sec":>10}')
+        for name in args.scenarios:
+            install(cfg, args.net_latency / 1000, args.db_latency / 1000)
+            try:
+                op = SCENARIOS[name](cfg)
+            except ImportError as e:
+                print(f'{name:<16} skipped, {e}')
+                continue
+            METRICS.reset()
+            report(name, measure(op, args.iterations))
+            if args.stages:
+                print(METRICS.summary())
+    finally:
+        os.unlink(path)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,42 @@
+import re
+import sys
+import argparse
+import subprocess
+
+LINE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+def measure(module):
+    out = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True, text=True
+    )
+    if out.returncode != 0:
+        sys.exit(out.stderr)
+    imports = []
+    for line in out.stderr.splitlines():
+        m = LINE.match(line)
+        if m:
+            imports.append((m.group(4), int(m.group(1)), int(m.group(2)), len(m.group(3)) // 2))
+    return imports
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Report per-module import cost and enforce a budget')
+    parser.add_argument('module', nargs='?', default='lambda_function')
+    parser.add_argument('--budget', type=float, default=50, help='max cumulative import time in ms')
+    parser.add_argument('--top', type=int, default=15)
+    args = parser.parse_args()
+
+    imports = measure(args.module)
+    total = next(cumulative for name, _, cumulative, _ in reversed(imports) if name == args.module) / 1000
+    print(f'{"module":<40} {"self ms":>8} {"cumul ms":>9}')
+    for name, own, cumulative, _ in sorted(imports, key=lambda i: i[1], reverse=True)[:args.top]:
+        print(f'{name:<40} {own / 1000:>8.1f} {cumulative / 1000:>9.1f}')
+    print(f'{args.module}: {total:.1f}ms (budget {args.budget:.0f}ms)')
+    if total > args.budget:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,26 @@
-from mutants import *
-
-
-CFG = load_config()
+import os
+import re
+from metrics import METRICS, timed
+from profiling import profiled
+
+# everything below is classified before mutants, config.yml or any client is loaded,
+# crawlers, link unfurlers and warmup pings never pay for a full invocation
+
+PATH = re.compile(r'/?([A-Za-z0-9]{8})/([A-Za-z0-9]{8})/([A-Za-z0-9]+)/?')
+ACTIONS = ('join',)
+SKIP_AGENTS = [ua.strip() for ua in os.environ.get(
+    'MUTANTS_SKIP_AGENTS',
+    # exact crawler tokens only, a generic 'bot' or 'preview' also matches real phones and browsers
+    'TelegramBot,Discordbot,Slackbot-LinkExpanding,Slack-ImgProxy,Twitterbot,facebookexternalhit,Facebot,'
+    'WhatsApp/,LinkedInBot,SkypeUriPreview,Googlebot,bingbot,redditbot'
+).split(',') if ua.strip()]
+# MUTANTS_SKIP_AGENTS='' turns skipping off, an empty pattern would match every agent instead
+SKIP_PATTERN = re.compile('|'.join(map(re.escape, SKIP_AGENTS)), re.IGNORECASE) if SKIP_AGENTS else None
+WARMUP_SOURCES = ('serverless-plugin-warmup', 'aws.events')
+# how long a join waits for its notifications, always at least DRAIN_MARGIN short of the function timeout,
+# paced sends due later stay on their timers and go out when the container next thaws
+DRAIN_SECS = float(os.environ.get('MUTANTS_DRAIN_SECS', 1))
+DRAIN_MARGIN = 1
 
 
 def error(code=500):
@@ -28,50 +47,78 @@ def ok(msg='ok'):
     }
 
 
-def parse_path(path):
-    parts = path.split('/')
-    if (len(parts[0]) == 8 and   # 8 char lobbyId
-        len(parts[1]) == 8 and   # 8 char slotId
-        parts[2] in ['join'] and # action
-        ''.join(parts).isalnum() # alphanumeric
-            ):
-        return parts[0], parts[1], parts[2]
-    else:
-        return None, None, None
+def classify(event):
+    if event.get('warmup') or event.get('source') in WARMUP_SOURCES:
+        return 'warmup', None
+    headers = event.get('headers') or {}
+    agent = headers.get('user-agent') or headers.get('User-Agent') or ''
+    if SKIP_PATTERN and SKIP_PATTERN.search(agent):
+        return 'prefetch', None
+    m = PATH.fullmatch(event.get('path') or '')
+    if not m:
+        return 'malformed', None
+    if m.group(3) not in ACTIONS:
+        return 'unknown', None
+    return m.group(3), m.groups()[:2]
 
 
+@profiled('lambda_handler')
 def lambda_handler(event, context):
-    # avoid prefetching
-    if event['headers']['user-agent'].startswith('Telegram'):
-        return ok()
+    try:
+        kind, ids = classify(event)
+        with timed(f'lambda.{kind}') as t:
+            r = handle(kind, ids, context)
+            t.outcome = 'ok' if r['statusCode'] < 400 else str(r['statusCode'])
+            return r
+    finally:
+        # cloudwatch picks the EMF lines out of the function's log
+        METRICS.flush()
 
-    path = event['path'][1:]  # remove preceeding '/'
-    lobbyId, slotId, action = parse_path(path)
-    if not lobbyId and not slotId:
-        return not_found('Not found.')
 
-    if action == 'join':
-        try:
-            lobby = Lobby(CFG, lobbyId)
-
-            if slotId in lobby.slots:
-                user = lobby.slots[slotId]
-                lobby.join(user)
-                return ok(msg=f'{user[:-5]} joined the lobby.')
-
-            else:
-                return not_found(msg='Lobby slot not found.')
-
-        except LobbyNotFound:
-            return not_found('Lobby not found.')
-        except LobbyPermissions:
-            return error(code=403)
-        except LobbyUserExists:
-            return ok(msg='User already joined lobby.')
-        except LobbyMaxUsers:
-            return ok(msg='Too many mutants, lobby is full.')
-        except Exception as e:
-            print(e)
-            return error()
-    else:
+def drain_timeout(context):
+    if context is None:
+        return DRAIN_SECS
+    return max(0, min(DRAIN_SECS, context.get_remaining_time_in_millis() / 1000 - DRAIN_MARGIN))
+
+
+def handle(kind, ids, context=None):
+    if kind in ('warmup', 'prefetch'):
+        return ok()
+    elif kind == 'malformed':
+        return not_found('Not found.')
+    elif kind == 'unknown':
         return not_found('Unknown')
+
+    from mutants import DISPATCHER
+    # no waiting out COALESCE_SECS here: the response would block on it and a window longer than the drain
+    # is stranded on a timer, a lambda join announces right away and the lease only keeps announcers from overlapping
+    DISPATCHER.max_delay = 0
+    try:
+        return join(*ids)
+    finally:
+        # the container freezes after returning, flush queued notifications first
+        DISPATCHER.drain(drain_timeout(context), mine=True)
+
+
+def join(lobbyId, slotId):
+    from mutants import (Lobby, LobbyNotFound, LobbySlotNotFound, LobbyPermissions,
+                         LobbyUserExists, LobbyMaxUsers, load_config)
+    try:
+        # warm invocations reuse the parsed config until config.yml changes
+        cfg = load_config()
+        user = Lobby(cfg).join_slot(lobbyId, slotId)
+        return ok(msg=f'{cfg.display(user)} joined the lobby.')
+
+    except LobbySlotNotFound:
+        return not_found(msg='Lobby slot not found.')
+    except LobbyNotFound:
+        return not_found('Lobby not found.')
+    except LobbyPermissions:
+        return error(code=403)
+    except LobbyUserExists:
+        return ok(msg='User already joined lobby.')
+    except LobbyMaxUsers:
+        return ok(msg='Too many mutants, lobby is full.')
+    except Exception as e:
+        print(e)
+        return error()
@@ -0,0 +1,241 @@
+import os
+import sys
+import time
+import random
+import argparse
+import collections
+from concurrent.futures import ThreadPoolExecutor
+
+from bench import FakeContext, install, make_config, percentile, write_config
+from metrics import METRICS
+from mutants import CLIENTS, DISPATCHER, Lobby, load_config
+
+# replays the moment after _notify_slots: every invitee clicks their join link at once
+
+
+# offsets in seconds from the invite going out, 'spread' is in seconds too
+DISTRIBUTIONS = {
+    'burst': lambda spread: 0.0,
+    'uniform': lambda spread: random.uniform(0, spread),
+    'exponential': lambda spread: random.expovariate(1 / spread) if spread else 0.0,
+    'normal': lambda spread: max(0.0, random.gauss(spread, spread / 3)),
+}
+
+# lambda_handler answers every outcome with a 200 and a message
+LAMBDA_REPLIES = {
+    'User already joined lobby.': 'LobbyUserExists',
+    'Too many mutants, lobby is full.': 'LobbyMaxUsers',
+}
+LAMBDA_STATUSES = {403: 'LobbyPermissions', 404: 'LobbyNotFound', 500: 'error'}
+
+COMPONENT_REPLIES = {
+    'Joined lobby.': 'joined',
+    "You've already joined the lobby.": 'LobbyUserExists',
+    'Too many mutants, lobby is full.': 'LobbyMaxUsers',
+    'Not a public lobby.': 'LobbyPermissions',
+    'Lobby no longer exists.': 'LobbyNotFound',
+}
+
+
+class Click:
+    __slots__ = ('at', 'lobbyId', 'slotId', 'user', 'outcome', 'latency')
+
+    def __init__(self, at, lobbyId, slotId, user):
+        self.at = at
+        self.lobbyId = lobbyId
+        self.slotId = slotId
+        self.user = user
+        self.outcome = None
+        self.latency = None
+
+
+def clicks_for(lobby, args):
+    # one click per invitee, some click twice
+    clicks = []
+    offset = DISTRIBUTIONS[args.distribution]
+    for slotId, user in lobby.slots.items():
+        n = 2 if random.random() < args.repeat else 1
+        for _ in range(n):
+            clicks.append(Click(offset(args.spread / 1000), lobby.lobbyId, slotId, user))
+    return sorted(clicks, key=lambda c: c.at)
+
+
+class LambdaTarget:
+    # each worker thread stands in for a separate lambda container, the handler drains only what its own
+    # invocation queued and the shared dispatcher gets a container's worth of workers per thread
+    def __init__(self, cfg):
+        import lambda_function
+        self.handler = lambda_function.lambda_handler
+
+
+    def run(self, clicks, concurrency):
+        workers = DISPATCHER.workers
+        DISPATCHER.resize(workers * concurrency)
+        try:
+            return self._run(clicks, concurrency)
+        finally:
+            DISPATCHER.resize(workers)
+
+
+    def _run(self, clicks, concurrency):
+        start = time.perf_counter()
+
+        def click(c):
+            delay = start + c.at - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            t = time.perf_counter()
+            try:
+                r = self.handler({'headers': {'user-agent': 'loadgen'},
+                                  'path': f'/{c.lobbyId}/{c.slotId}/join'}, None)
+                c.outcome = self.outcome(r)
+            except Exception as e:
+                c.outcome = type(e).__name__
+            c.latency = time.perf_counter() - t
+
+        with ThreadPoolExecutor(concurrency) as pool:
+            list(pool.map(click, clicks))
+        return time.perf_counter() - start
+
+
+    @staticmethod
+    def outcome(r):
+        if r['statusCode'] != 200:
+            return LAMBDA_STATUSES.get(r['statusCode'], str(r['statusCode']))
+        if r['body'].endswith(' joined the lobby.'):
+            return 'joined'
+        return LAMBDA_REPLIES.get(r['body'], r['body'])
+
+
+class ComponentTarget:
+    # one event loop like the bot's, concurrency caps the interactions in flight
+    def __init__(self, cfg):
+        import asyncio
+        import main
+        self.asyncio = asyncio
+        self.handler = main.on_component
+
+
+    def run(self, clicks, concurrency):
+        asyncio = self.asyncio
+
+        async def stampede():
+            gate = asyncio.Semaphore(concurrency)
+            start = time.perf_counter()
+
+            async def click(c):
+                await asyncio.sleep(max(0.0, start + c.at - time.perf_counter()))
+                async with gate:
+                    ctx = FakeContext(f'{c.lobbyId}-join', c.user)
+                    t = time.perf_counter()
+                    try:
+                        await self.handler(ctx)
+                        c.outcome = COMPONENT_REPLIES.get(ctx.replies[-1], ctx.replies[-1]) if ctx.replies else 'no reply'
+                    except Exception as e:
+                        c.outcome = type(e).__name__
+                    c.latency = time.perf_counter() - t
+
+            await asyncio.gather(*(click(c) for c in clicks))
+            return time.perf_counter() - start
+
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(stampede())
+        finally:
+            loop.close()
+
+
+TARGETS = {
+    'lambda': LambdaTarget,
+    'component': ComponentTarget,
+}
+
+
+def audit(cfg, lobby, clicks):
+    # the stored roster must hold every reported join exactly once and never more than max
+    item = CLIENTS.storage(cfg).get(lobby.lobbyId)
+    joined = item['joined']
+    reported = {c.user for c in clicks if c.outcome == 'joined'}
+    return {
+        'lost': len(reported - set(joined)),
+        'phantom': len(set(joined) - reported - {lobby.creator}),
+        'duplicate': len(joined) - len(set(joined)),
+        'overfull': max(0, len(joined) - item['max']),
+    }
+
+
+def run(target, cfg, args):
+    creator = next(iter(cfg.users))
+    seats = args.seats or len(cfg.users)
+    outcomes = collections.Counter()
+    anomalies = collections.Counter()
+    latencies = []
+    elapsed = 0.0
+    for _ in range(args.lobbies):
+        lobby = Lobby(cfg).new(creator=creator, joined=[], max=seats)
+        DISPATCHER.drain()
+        clicks = clicks_for(lobby, args)
+        elapsed += target.run(clicks, args.concurrency)
+        DISPATCHER.drain()
+        outcomes.update(c.outcome for c in clicks)
+        anomalies.update(audit(cfg, lobby, clicks))
+        latencies.extend(c.latency for c in clicks if c.latency is not None)
+    return outcomes, anomalies, latencies, elapsed
+
+
+def report(name, outcomes, anomalies, latencies, elapsed):
+    total = sum(outcomes.values())
+    print(f'{name}: {total} clicks in {elapsed:.2f}s, {total / elapsed if elapsed else float("inf"):.1f} clicks/sec')
+    if latencies:
+        print('  latency ms  ' + '  '.join(f'p{p}={percentile(latencies, p) * 1000:.2f}' for p in (50, 95, 99, 99.9))
+              + f'  max={max(latencies) * 1000:.2f}')
+    for outcome, n in outcomes.most_common():
+        print(f'  {outcome:<20} {n:>7} {n / total:>7.1%}')
+    print('  ' + ', '.join(f'{k}={anomalies[k]}' for k in ('lost', 'phantom', 'duplicate', 'overfull')))
+    return sum(anomalies.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Simulate invitees stampeding their join links right after a lobby is announced')
+    parser.add_argument('targets', nargs='*', default=list(TARGETS), help=', '.join(TARGETS))
+    parser.add_argument('-c', '--concurrency', type=int, default=32, help='clicks in flight at once')
+    parser.add_argument('--roster', type=int, default=50, help='invitees per lobby (size of USERS)')
+    parser.add_argument('--seats', type=int, default=0, help='lobby max, default the whole roster')
+    parser.add_argument('--lobbies', type=int, default=5, help='lobbies announced one after another')
+    parser.add_argument('--distribution', choices=DISTRIBUTIONS, default='exponential', help='click times after the invite')
+    parser.add_argument('--spread', type=float, default=200, help='click-time scale in ms (window, mean or peak)')
+    parser.add_argument('--repeat', type=float, default=0.1, help='fraction of invitees who click twice')
+    parser.add_argument('--net-latency', type=float, default=0, help='telegram/discord latency in ms')
+    parser.add_argument('--db-latency', type=float, default=5, help='storage latency in ms')
+    parser.add_argument('--seed', type=int, help='random seed for click times and repeats')
+    parser.add_argument('--stages', action='store_true', help='print per-stage latency from the metrics registry')
+    args = parser.parse_args()
+
+    if args.seed is not None:
+        random.seed(args.seed)
+    # keep lambda_handler's per-invocation EMF lines out of the report
+    METRICS.flush = lambda: None
+
+    path = write_config(make_config(args.roster, channels=2, webhooks=2))
+    failed = 0
+    try:
+        cfg = load_config()
+        for name in args.targets:
+            install(cfg, args.net_latency / 1000, args.db_latency / 1000)
+            try:
+                target = TARGETS[name](cfg)
+            except ImportError as e:
+                print(f'{name}: skipped, {e}')
+                continue
+            METRICS.reset()
+            failed += report(name, *run(target, cfg, args))
+            if args.stages:
+                print(METRICS.summary())
+    finally:
+        os.unlink(path)
+    # nonzero when a join went missing, so this can gate a deploy
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,4 +1,6 @@
 from mutants import *
+from metrics import METRICS, timed
+from profiling import configure, profiled
 import discord
 from discord_slash import SlashCommand
 from discord_slash.model import SlashCommandOptionType, ButtonStyle
@@ -7,6 +9,7 @@ from discord_slash.utils.manage_components import create_button, create_actionro
 
 
 CFG = load_config()
+configure(CFG.get('PROFILE_DIR'), CFG.get('PROFILE_RATE'))
 client = discord.Client(intents=discord.Intents.all())
 slash = SlashCommand(client, sync_commands=True)
 
@@ -60,32 +63,36 @@ async def on_ready():
 
 
 @client.event
+@profiled('on_component')
 async def on_component(ctx: ComponentContext):
+    # ack inside discord's 3s interaction window, every reply below is a hidden follow-up
+    await ctx.defer(hidden=True)
+    with timed('bot.component'):
+        await _component(ctx)
+
+
+async def _component(ctx):
     parts = ctx.custom_id.split('-')
     lobbyId = parts[0]
     action = parts[1]
     user = str(ctx.author)
     
     try:
-        lobby = Lobby(CFG, lobbyId)
+        if action == 'join':
+            await AsyncLobby.join_id(CFG, lobbyId, user)
+            await ctx.send('Joined lobby.', hidden=True)
+        elif action == 'view':
+            lobby = await AsyncLobby.load(CFG, lobbyId, cached=True, profile=LOAD_VIEW)
+            joined = [CFG.display(j) for j in lobby.joined]
+            await ctx.send(f'Mutants: {", ".join(joined)}', hidden=True)
     except LobbyNotFound:
         await ctx.send('Lobby no longer exists.', hidden=True)
-        return
-    
-    if action == 'join':
-        try:
-            lobby.join(user)
-            await ctx.send('Joined lobby.', hidden=True)
-        except LobbyPermissions:
-            await ctx.send('Not a public lobby.', hidden=True)
-        except LobbyUserExists:
-            await ctx.send("You've already joined the lobby.", hidden=True)
-        except LobbyMaxUsers:
-            await ctx.send('Too many mutants, lobby is full.', hidden=True)
-
-    elif action == 'view':
-        joined = [j[:-5] for j in lobby.joined]
-        await ctx.send(f'Mutants: {", ".join(joined)}', hidden=True)
+    except LobbyPermissions:
+        await ctx.send('Not a public lobby.', hidden=True)
+    except LobbyUserExists:
+        await ctx.send("You've already joined the lobby.", hidden=True)
+    except LobbyMaxUsers:
+        await ctx.send('Too many mutants, lobby is full.', hidden=True)
 
 
 @slash.slash(name='mutants',
@@ -93,21 +100,66 @@ async def on_component(ctx: ComponentContext):
              description='Start a mutant lobby',
              options=OPTIONS
              )
+@profiled('_createLobby')
 async def _createLobby(ctx, mutant2=None, mutant3=None, mutant4=None, public=False):
+    # ack first, the save runs after and telegram/webhook fan-out stays queued on the dispatcher
+    await ctx.defer()
+    with timed('bot.create'):
+        await _create(ctx, mutant2, mutant3, mutant4, public)
+
+
+async def _create(ctx, mutant2, mutant3, mutant4, public):
     creator = str(ctx.author)
-    if creator not in CFG['USERS']:
+    if creator not in CFG.users:
         await ctx.send(f'Who the fuck are you.')
         return
 
+    # one open lobby per creator, a duplicate would only repeat every invite
+    existing = await AsyncLobby.open_for(CFG, creator)
+    if existing:
+        await ctx.send(f'You already have `{existing.name}` open', components=[create_actionrow(*buttons(existing.lobbyId))])
+        return
+
     joined = []
     for m in [mutant2, mutant3, mutant4]:
         if m:
             joined.append(str(m))
 
-    lobby = Lobby(CFG).new(creator=creator, joined=joined, public=public)
+    lobby = await AsyncLobby.create(CFG, creator=creator, joined=joined, public=public)
 
     msg = f'Created `{lobby.name}`'
     await ctx.send(msg, components=[create_actionrow(*buttons(lobby.lobbyId))])
 
 
-client.run(CFG['D_TOKEN'])
+@slash.slash(name='lobbies',
+             guild_ids=CFG['D_SERVERS'],
+             description='List open mutant lobbies'
+             )
+async def _listLobbies(ctx):
+    await ctx.defer(hidden=True)
+    with timed('bot.lobbies'):
+        await _list(ctx)
+
+
+async def _list(ctx):
+    lobbies = await AsyncLobby.open_lobbies(CFG, limit=10)
+    if not lobbies:
+        await ctx.send('No open lobbies.', hidden=True)
+        return
+    lines = [f'`{l.name}` {len(l.joined)}/{l.max}: {", ".join(CFG.display(j) for j in l.joined)}' for l in lobbies]
+    await ctx.send('\n'.join(lines), hidden=True)
+
+
+@slash.slash(name='mutants-stats',
+             guild_ids=CFG['D_SERVERS'],
+             description='Latency of lobby storage, notifications and handlers'
+             )
+async def _stats(ctx):
+    if str(ctx.author) not in CFG.get('ADMINS', []):
+        await ctx.send('Admins only.', hidden=True)
+        return
+    await ctx.send(f'```\n{METRICS.summary() or "No samples yet."}\n```', hidden=True)
+
+
+if __name__ == '__main__':
+    client.run(CFG['D_TOKEN'])
@@ -0,0 +1,144 @@
+import json
+import time
+import bisect
+import threading
+
+# bucket upper bounds in ms, ~12% apart from 0.05ms to ~2min
+BOUNDS = tuple(0.05 * 1.12 ** i for i in range(130))
+EMF_VALUES = 100  # most values one EMF metric member may carry
+
+
+class Histogram:
+    __slots__ = ('counts', 'count', 'sum', 'min', 'max')
+
+    def __init__(self):
+        self.counts = [0] * (len(BOUNDS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = float('inf')
+        self.max = 0.0
+
+
+    def add(self, ms):
+        self.counts[bisect.bisect_left(BOUNDS, ms)] += 1
+        self.count += 1
+        self.sum += ms
+        if ms < self.min:
+            self.min = ms
+        if ms > self.max:
+            self.max = ms
+
+
+    def representatives(self):
+        # (value, count) per non-empty bucket, the bucket's midpoint kept inside the observed min and max
+        for i, n in enumerate(self.counts):
+            if n:
+                lo = BOUNDS[i - 1] if i else 0.0
+                hi = BOUNDS[i] if i < len(BOUNDS) else self.max
+                yield min(max((lo + hi) / 2, self.min), self.max), n
+
+
+    def percentile(self, pct):
+        target = pct / 100 * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if n and seen >= target:
+                return min(BOUNDS[i] if i < len(BOUNDS) else self.max, self.max)
+        return self.max
+
+
+class Registry:
+    # in-process latency histograms keyed on (stage, outcome)
+    def __init__(self, namespace='Mutants'):
+        self.namespace = namespace
+        self._series = {}
+        self._lock = threading.Lock()
+
+
+    def record(self, stage, seconds, outcome='ok'):
+        with self._lock:
+            h = self._series.get((stage, outcome))
+            if h is None:
+                h = self._series[(stage, outcome)] = Histogram()
+            h.add(seconds * 1000)
+
+
+    def reset(self):
+        with self._lock:
+            self._series = {}
+
+
+    def _take(self, reset):
+        with self._lock:
+            series = self._series
+            if reset:
+                self._series = {}
+            else:
+                series = dict(series)
+        return sorted(series.items())
+
+
+    def emf(self, reset=True):
+        # cloudwatch embedded metric format, a metric member may only be a number or up to 100 numbers,
+        # so each (stage, outcome) is written as bucket values repeated by count over as many lines as it takes
+        now = int(time.time() * 1000)
+        lines = []
+        for (stage, outcome), h in self._take(reset):
+            values = []
+            for value, n in h.representatives():
+                values.extend([round(value, 3)] * n)
+            for i in range(0, len(values), EMF_VALUES):
+                lines.append(json.dumps({
+                    '_aws': {
+                        'Timestamp': now,
+                        'CloudWatchMetrics': [{
+                            'Namespace': self.namespace,
+                            'Dimensions': [['Stage', 'Outcome']],
+                            'Metrics': [{'Name': 'Latency', 'Unit': 'Milliseconds'}]
+                        }]
+                    },
+                    'Stage': stage,
+                    'Outcome': outcome,
+                    'Latency': values[i:i + EMF_VALUES]
+                }))
+        return lines
+
+
+    def flush(self):
+        for line in self.emf(reset=True):
+            print(line)
+
+
+    def summary(self):
+        lines = []
+        for (stage, outcome), h in self._take(reset=False):
+            lines.append(f'{stage} [{outcome}] n={h.count} '
+                         f'p50={h.percentile(50):.1f} p95={h.percentile(95):.1f} '
+                         f'p99={h.percentile(99):.1f} max={h.max:.1f}ms')
+        return '\n'.join(lines)
+
+
+METRICS = Registry()
+
+
+class timed:
+    # with timed('lobby.load'): ... records the block's latency,
+    # outcome is the exception name on failure unless the block sets t.outcome itself
+    __slots__ = ('stage', 'registry', 'start', 'outcome')
+
+    def __init__(self, stage, registry=METRICS):
+        self.stage = stage
+        self.registry = registry
+        self.outcome = None
+
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+
+    def __exit__(self, exc_type, exc, tb):
+        outcome = exc_type.__name__ if exc_type is not None else self.outcome or 'ok'
+        self.registry.record(self.stage, time.perf_counter() - self.start, outcome)
+        return False
@@ -1,10 +1,33 @@
+import os
+import copy
 import time
-import uuid
-import yaml
-import boto3
-import telebot
+import heapq
+import functools
+import string
 import secrets
-import requests
+import threading
+from collections import OrderedDict, namedtuple
+import storage
+from metrics import timed
+from notify import DISPATCHER, TelegramSender, WebhookSender
+from storage import ConditionFailed, slot_key
+
+# telebot, boto3, yaml, requests and asyncio are imported on first use to keep lambda cold starts short,
+# check with: python importtime.py
+
+
+ID_ALPHABET = string.ascii_letters + string.digits
+ID_LENGTH = 8  # lambda_function.PATH expects 8 alphanumeric chars
+ID_ATTEMPTS = 5
+
+
+def new_id():
+    # 62^8 (~2^47) ids instead of the 16^8 a truncated uuid4 gives
+    return ''.join(secrets.choice(ID_ALPHABET) for _ in range(ID_LENGTH))
+
+
+class LobbyIdCollision(Exception):
+    pass
 
 
 class LobbyNotFound(Exception):
@@ -23,79 +46,393 @@ class LobbyPermissions(Exception):
     pass
 
 
+class LobbySlotNotFound(Exception):
+    pass
+
+
+class Clients:
+    # process-wide registry, survives warm lambda invocations and bot events
+    def __init__(self):
+        self._clients = {}
+        self._lock = threading.RLock()
+
+
+    def get(self, key, factory):
+        client = self._clients.get(key)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(key)
+                if client is None:
+                    client = self._clients[key] = factory()
+        return client
+
+
+    def set(self, key, client):
+        self._clients[key] = client
+
+
+    def clear(self):
+        self._clients.clear()
+
+
+    def telegram(self, token):
+        def factory():
+            import telebot
+            return telebot.TeleBot(token)
+        return self.get(('telegram', token), factory)
+
+
+    def telegram_sender(self, config):
+        def factory():
+            return TelegramSender(
+                self.telegram(config['T_TOKEN']),
+                rate=config.get('T_RATE', 30),
+                chat_rate=config.get('T_CHAT_RATE', 1),
+                group_rate=config.get('T_GROUP_RATE', 20 / 60)
+            )
+        return self.get(('telegram-sender', config['T_TOKEN']), factory)
+
+
+    def dynamodb(self, region='us-west-2'):
+        def factory():
+            import boto3
+            from botocore.config import Config
+            return boto3.session.Session().resource(
+                'dynamodb',
+                region_name=region,
+                config=Config(max_pool_connections=50, tcp_keepalive=True)
+            )
+        return self.get(('dynamodb', region), factory)
+
+
+    def table(self, name, region='us-west-2'):
+        return self.get(('table', region, name), lambda: self.dynamodb(region).Table(name))
+
+
+    def http(self, host=None):
+        def factory():
+            import requests
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=DISPATCHER.workers)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            return session
+        return self.get(('http', host), factory)
+
+
+    def webhooks(self, config):
+        def factory():
+            # D_TIMEOUT is a single number of seconds, by default connect and read get their own
+            return WebhookSender(self.http, timeout=config.get('D_TIMEOUT') or (3.05, 10))
+        return self.get('webhooks', factory)
+
+
+    @staticmethod
+    def storage_key(config):
+        return ('storage', config.get('STORAGE', 'dynamodb'), config.get('TABLE'), config.get('STORAGE_PATH'))
+
+
+    def storage(self, config):
+        return self.get(self.storage_key(config), lambda: storage.connect(config, self))
+
+
+CLIENTS = Clients()
+
+
+class LobbyCache:
+    # per-process LRU of lobby items, an entry never outlives the lobby's own expiry,
+    # items are copied in and out so a Lobby mutating joined in place can't change the cached one
+    def __init__(self, size=512, ttl=60):
+        self.size = size
+        self.ttl = ttl
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+
+    def get(self, lobbyId):
+        with self._lock:
+            entry = self._items.get(lobbyId)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                del self._items[lobbyId]
+                return None
+            self._items.move_to_end(lobbyId)
+            return copy.deepcopy(entry[1])
+
+
+    def put(self, lobbyId, item):
+        deadline = min(time.time() + self.ttl, item.get('expires', float('inf')))
+        with self._lock:
+            self._items[lobbyId] = (deadline, copy.deepcopy(item))
+            self._items.move_to_end(lobbyId)
+            while len(self._items) > self.size:
+                self._items.popitem(last=False)
+
+
+    def update(self, lobbyId, **attrs):
+        with self._lock:
+            entry = self._items.get(lobbyId)
+            if entry is not None:
+                entry[1].update(copy.deepcopy(attrs))
+
+
+    def invalidate(self, lobbyId):
+        with self._lock:
+            self._items.pop(lobbyId, None)
+
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+
+LOBBIES = LobbyCache()
+# roster length this process last put in each announcement message, keyed on (kind, to, message id)
+SHOWN = LobbyCache(size=1024, ttl=3600)
+
+
+LEASE_GRACE = 10  # seconds past COALESCE_SECS before another join takes over an unreleased announce lease
+
+
+def new_lease():
+    # '<epoch ms>:<id>', unique per join and stamped with when it was taken
+    return f'{int(time.time() * 1000)}:{new_id()}'
+
+
+def lease_age(lease):
+    return time.time() - int(lease.split(':')[0]) / 1000
+
+
+def expired(item, now=None):
+    # dynamodb's ttl only deletes expired items eventually, readers check expires themselves
+    return 'expires' in item and item['expires'] <= (time.time() if now is None else now)
+
+
+# which attributes _load reads and whether it needs a strongly consistent read,
+# projected eventually consistent reads cost half the read capacity
+LoadProfile = namedtuple('LoadProfile', ['attrs', 'consistent'])
+LOAD_FULL = LoadProfile(None, True)
+LOAD_VIEW = LoadProfile(('lobbyId', 'joined', 'expires'), False)
+
+
 class Lobby:
-    def __init__(self, config, lobbyId=None):
-        self.c = config
-        self.telegram = telebot.TeleBot(self.c['T_TOKEN'])
-        self.db = boto3.resource('dynamodb', region_name='us-west-2').Table(self.c['TABLE'])
+    # slots are not part of the item, each one is its own record under storage.slot_key
+    # 'active' is the partition of the active-lobby index, always ACTIVE
+    ATTRS = ('creator', 'joined', 'lobbyId', 'name', 'public', 'max', 'expires', 'messages', 'active')
+    ACTIVE = 'open'
+
+    def __init__(self, config, lobbyId=None, cached=False, profile=LOAD_FULL):
+        self._dirty = set()
+        self._new = False
+        self.c = config if isinstance(config, Config) else Config(config)
+        self.telegram = CLIENTS.telegram_sender(self.c)
+        self.webhooks = CLIENTS.webhooks(self.c)
+        self.db = CLIENTS.storage(self.c)
+        self.notify = DISPATCHER
         if lobbyId:
-            self._load(lobbyId)
+            self._load(lobbyId, cached, profile)
 
 
-    def _load(self, lobbyId):
-        l = self.db.get_item(Key={'lobbyId': lobbyId})
-        if 'Item' in l:
-            for attr in l['Item']:
-                setattr(self, attr, l['Item'][attr])
-        else:
-            raise LobbyNotFound()
+    def _load(self, lobbyId, cached=False, profile=LOAD_FULL):
+        item = LOBBIES.get(lobbyId) if cached else None
+        if item is None:
+            # a cached load refills the cache with the whole item, only uncached loads use the projection
+            attrs = None if cached else profile.attrs
+            with timed('lobby.load'):
+                item = self.db.get(lobbyId, attrs=attrs, consistent=profile.consistent)
+            if item is None or expired(item):
+                LOBBIES.invalidate(lobbyId)
+                raise LobbyNotFound()
+            if attrs is None:
+                # only whole items are cached, a projection would hide attributes from later readers
+                LOBBIES.put(lobbyId, item)
+        for attr in item:
+            setattr(self, attr, item[attr])
+        self._dirty.clear()
+
+
+    def __setattr__(self, attr, value):
+        if attr in self.ATTRS and '_dirty' in self.__dict__:
+            self._dirty.add(attr)
+        object.__setattr__(self, attr, value)
+
+
+    def touch(self, *attrs):
+        # mark attributes mutated in place, e.g. self.joined.append(user)
+        self._dirty.update(attrs)
 
 
     def _save(self):
-        self.db.put_item(Item={
-            'creator': self.creator,
-            'joined': self.joined,
-            'lobbyId': self.lobbyId,
-            'name': self.name,
-            'public': self.public,
-            'slots': self.slots,
-            'max': self.max,
-            'expires': self.expires
-        })
+        with timed('lobby.save'):
+            self._write()
+
+
+    def _write(self):
+        if self._new:
+            item = self._create()
+            LOBBIES.put(self.lobbyId, item)
+            self.db.put_many([
+                {'lobbyId': slot_key(self.lobbyId, slotId), 'user': user, 'expires': self.expires}
+                for slotId, user in self.slots.items()
+            ])
+            self._new = False
+        elif self._dirty:
+            fields = {f: getattr(self, f) for f in sorted(self._dirty - {'lobbyId'})}
+            self.db.update(self.lobbyId, fields)
+            LOBBIES.update(self.lobbyId, **fields)
+        self._dirty.clear()
+
+
+    def _create(self):
+        # conditional put, retried with a fresh id so a collision never overwrites another lobby
+        for _ in range(ID_ATTEMPTS):
+            item = {attr: getattr(self, attr) for attr in self.ATTRS}
+            try:
+                self.db.put(item, new=True)
+                return item
+            except ConditionFailed:
+                self.lobbyId = new_id()
+        raise LobbyIdCollision()
+
+
+    def _names(self):
+        # the vocabulary only changes with config.yml, live names are seeded from the active index once per process
+        if LOBBY_NAMES.words is not self.c.words:
+            LOBBY_NAMES.use(self.c.words)
+        if not LOBBY_NAMES.seeded:
+            LOBBY_NAMES.seed((item['name'], item['expires'])
+                             for item in self.db.query('active', self.ACTIVE, int(time.time())))
+        return LOBBY_NAMES
 
 
     def _create_slots(self):
-        for user in self.c['USERS']:
+        for user in self.c.users:
             if user not in self.joined:
-                self.slots[str(uuid.uuid4())[:8]] = user
+                slotId = new_id()
+                while slotId in self.slots:
+                    slotId = new_id()
+                self.slots[slotId] = user
 
 
     def _notify_slots(self):
         for slot in self.slots:
-            if not 'telegram' in self.c['USERS'][user]:
-                continue
             user = self.slots[slot]
+            chatId = self.c.telegram_ids.get(user)
+            if chatId is None:
+                continue
             inviteUrl = self.c['API'] + self.lobbyId + '/' + slot + '/join'
-            chatId = self.c['USERS'][user]['telegram']
             msg = f"[Join {self.name}!]({inviteUrl})"
-            self.telegram.send_message(text=msg, chat_id=chatId, parse_mode='Markdown')
+            self.notify.submit(self.telegram.send_message, text=msg, chat_id=chatId, parse_mode='Markdown')
+
+
+    def _status(self, joined=None):
+        joined = self.joined if joined is None else joined
+        return f'{self.name} ({len(joined)}/{self.max}): {", ".join(self.c.display(j) for j in joined)}'
 
 
     def _notify_create(self):
-        joined = [j[:-5] for j in self.joined]
-        msg = f'{", ".join(joined)} created {self.name}'
-        for chan in self.c['T_CHANNELS']:
-            self.telegram.send_message(text=msg, chat_id=chan, parse_mode='Markdown')
+        # the announcement ids are kept so joins can edit the same messages instead of posting new ones
+        msg = self._status()
+        sends = []
+        for chan in self.c.channels:
+            future = self.notify.submit(self.telegram.send_message, text=msg, chat_id=chan, parse_mode='Markdown')
+            sends.append(('telegram', chan, future))
+        for hook in self.c.webhooks:
+            future = self.notify.submit(self.webhooks.post, hook, params={'wait': 'true'}, json={'username': self.name, 'content': msg})
+            sends.append(('discord', hook, future))
+        self.notify.after([future for _, _, future in sends], self._remember_messages, sends)
+
+
+    def _remember_messages(self, sends):
+        messages = []
+        for kind, to, future in sends:
+            sent = future.result()
+            if sent is None:
+                continue
+            msgId = sent.message_id if kind == 'telegram' else sent.json()['id']
+            messages.append({'kind': kind, 'to': to, 'id': msgId})
+        self.messages = messages
+        self._save()
 
 
-    def _notify_join(self, user):
-        for hook in self.c['D_WEBHOOKS']:
-            r = requests.post(hook, json={'username': self.name, 'content': f'{user[:-5]} joined'})
-        for chan in self.c['T_CHANNELS']:
-            self.telegram.send_message(text=f'{user[:-5]} joined {self.name}', chat_id=chan, parse_mode='Markdown')
+    def _notify_join(self, held, lease):
+        # one announcer per lobby across the bot and every lambda container: the join whose lease landed
+        # in 'announce' flushes after COALESCE_SECS, joins made while it is held are in that flush's roster.
+        # on lambda the dispatcher caps the window at 0 (see lambda_function.handle)
+        window = self.c.get('COALESCE_SECS', 0)
+        if held != lease:
+            if held is None or lease_age(held) < window + LEASE_GRACE:
+                return
+            # the holder never flushed, e.g. its lambda container was frozen first, take the lease over
+            try:
+                self.db.swap(self.lobbyId, 'announce', held, lease)
+            except ConditionFailed:
+                return
+        self.notify.later(window, self._announce_joins, lease)
+
+
+    def _announce_joins(self, lease):
+        try:
+            # releasing the lease returns the roster as it is now
+            item = self.db.swap(self.lobbyId, 'announce', lease, None)
+        except ConditionFailed:
+            # taken over as stale, the new holder announces
+            return
+        status = self._status(item['joined'])
+        messages = item.get('messages')
+        if not messages:
+            # the announcement ids aren't saved yet, post the status as new messages
+            for hook in self.c.webhooks:
+                self.notify.submit(self.webhooks.post, hook, json={'username': self.name, 'content': status})
+            for chan in self.c.channels:
+                self.notify.submit(self.telegram.send_message, text=status, chat_id=chan, parse_mode='Markdown')
+            return
+        for m in messages:
+            # each edit starts with the roster the release returned, only a rescheduled one reads again
+            self.notify.submit(self._edit_status, m, [item['joined']])
+
+
+    def _edit_status(self, m, fresh=None):
+        # the roster only grows, so within this process an edit never replaces a longer roster than it carries.
+        # edits from different processes are not ordered, a stale one stays up until the next join's edit
+        joined = fresh.pop() if fresh else None
+        if m['kind'] == 'telegram':
+            self.telegram.pace(m['to'])
+        if joined is None:
+            # rescheduled after a pacing delay or a 429, the roster has likely grown since
+            item = self.db.get(self.lobbyId, attrs=('joined',))
+            if item is None:
+                return None
+            joined = item['joined']
+        status = self._status(joined)
+        key = (m['kind'], m['to'], m['id'])
+        shown = SHOWN.get(key)
+        if shown is not None and shown['count'] >= len(joined):
+            # this process already put this roster or a longer one up, don't spend a rate-limited call on it
+            return None
+        if m['kind'] == 'telegram':
+            sent = self.telegram.edit_message_text(text=status, chat_id=m['to'], message_id=m['id'], parse_mode='Markdown')
+        else:
+            sent = self.webhooks.patch(f"{m['to']}/messages/{m['id']}", json={'content': status})
+        SHOWN.put(key, {'count': len(joined), 'expires': self.expires})
+        return sent
 
 
     def new(self, creator, max=5, public=False, joined=[], expireMins=120):
         if creator not in joined:
             joined.append(creator)
+        self._new = True
         setattr(self, 'creator', creator)
-        setattr(self, 'lobbyId', str(uuid.uuid4())[:8])
-        setattr(self, 'name', rand_lobby_name())
+        setattr(self, 'lobbyId', new_id())
+        setattr(self, 'expires', int(time.time()) + (60*expireMins))
+        setattr(self, 'name', self._names().take(self.expires))
         setattr(self, 'max', max)
         setattr(self, 'joined', joined)
-        setattr(self, 'expires', int(time.time()) + (60*expireMins))
         setattr(self, 'public', public)
         setattr(self, 'slots', {}) # self.loadSLots?
+        setattr(self, 'messages', [])
+        setattr(self, 'active', self.ACTIVE)
         self._create_slots()
         self._save()
         self._notify_create()
@@ -104,1160 +441,1350 @@ class Lobby:
 
 
     def join(self, user):
-        if not self.public and user not in self.c['USERS']:
+        # single conditional update in the backend, concurrent joins can't overwrite each other
+        member = user in self.c.users
+        lease = new_lease()
+        try:
+            with timed('lobby.join'):
+                item = self.db.join(self.lobbyId, user, member, int(time.time()), lease)
+        except ConditionFailed as e:
+            LOBBIES.invalidate(self.lobbyId)
+            self._join_failed(user, member, e.item)
+        for attr in item:
+            setattr(self, attr, item[attr])
+        self._dirty.difference_update(item)
+        LOBBIES.put(self.lobbyId, item)
+        self._notify_join(item.get('announce'), lease)
+        return self
+
+
+    def join_slot(self, lobbyId, slotId):
+        # join links resolve through the slot's own record, the lobby item is only touched by the join update
+        with timed('lobby.slot'):
+            slot = self.db.get(slot_key(lobbyId, slotId), attrs=('user', 'expires'))
+            if slot is None:
+                slot = self._legacy_slot(lobbyId, slotId)
+        if slot is None:
+            raise LobbySlotNotFound()
+        if expired(slot):
+            raise LobbyNotFound()
+        self.lobbyId = lobbyId
+        self.join(slot['user'])
+        return slot['user']
+
+
+    def _legacy_slot(self, lobbyId, slotId):
+        # lobbies created before slot records kept their slots in the item, their invites stay valid until they expire
+        item = self.db.get(lobbyId, attrs=('slots', 'expires'))
+        user = item and (item.get('slots') or {}).get(slotId)
+        if user is None:
+            return None
+        return {'user': user, 'expires': item['expires']} if 'expires' in item else {'user': user}
+
+
+    @classmethod
+    def from_item(cls, config, item):
+        lobby = cls(config)
+        for attr in item:
+            setattr(lobby, attr, item[attr])
+        lobby._dirty.clear()
+        return lobby
+
+
+    @classmethod
+    def open_lobbies(cls, config, limit=None):
+        # open lobbies that still have room, soonest to expire first
+        now = int(time.time())
+        lobbies = []
+        for item in CLIENTS.storage(config).query('active', cls.ACTIVE, now):
+            if len(item['joined']) < item['max']:
+                lobbies.append(cls.from_item(config, item))
+                if limit and len(lobbies) >= limit:
+                    break
+        return lobbies
+
+
+    @classmethod
+    def open_for(cls, config, creator):
+        # the creator's live lobby with room left, if any
+        now = int(time.time())
+        for item in CLIENTS.storage(config).query('creator', creator, now):
+            if len(item['joined']) < item['max']:
+                return cls.from_item(config, item)
+        return None
+
+
+    def _join_failed(self, user, member, item):
+        if not item or expired(item):
+            raise LobbyNotFound()
+        if not member and not item.get('public'):
             raise LobbyPermissions()
-        elif user in self.joined:
+        elif user in item.get('joined', []):
             raise LobbyUserExists()
-        elif self.max <= len(self.joined):
-            raise LobbyMaxUsers()
         else:
-            self.joined.append(user)
-            self._save()
-            self._notify_join(user)
-            return self
+            raise LobbyMaxUsers()
+
+
+class AsyncLobby:
+    # runs Lobby storage and notification I/O off the event loop
+    def __init__(self, lobby):
+        self.lobby = lobby
+
 
+    def __getattr__(self, attr):
+        return getattr(self.lobby, attr)
 
-def load_config():
-    with open('config.yml', 'r') as cfg:
+
+    @staticmethod
+    async def _run(fn, *args, **kwargs):
+        import asyncio
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(fn, *args, **kwargs))
+
+
+    @classmethod
+    async def load(cls, config, lobbyId, cached=False, profile=LOAD_FULL):
+        return cls(await cls._run(Lobby, config, lobbyId, cached, profile))
+
+
+    @classmethod
+    async def create(cls, config, **kwargs):
+        lobby = await cls._run(Lobby, config)
+        return cls(await cls._run(lobby.new, **kwargs))
+
+
+    async def join(self, user):
+        await self._run(self.lobby.join, user)
+        return self
+
+
+    @classmethod
+    async def join_id(cls, config, lobbyId, user):
+        # no read first, the conditional update reports a missing or expired lobby as LobbyNotFound
+        lobby = cls(await cls._run(Lobby.from_item, config, {'lobbyId': lobbyId}))
+        return await lobby.join(user)
+
+
+    @classmethod
+    async def open_lobbies(cls, config, limit=None):
+        return [cls(lobby) for lobby in await cls._run(Lobby.open_lobbies, config, limit)]
+
+
+    @classmethod
+    async def open_for(cls, config, creator):
+        lobby = await cls._run(Lobby.open_for, config, creator)
+        return cls(lobby) if lobby else None
+
+
+def display_name(user):
+    # strip the discord discriminator, 'name#1234' -> 'name'
+    return user[:-5]
+
+
+class Config(dict):
+    # config.yml plus the lookups the hot paths need, computed once per load
+    def __init__(self, raw):
+        super().__init__(raw or {})
+        users = self.get('USERS') or {}
+        self.users = frozenset(users)
+        self.telegram_ids = {u: o['telegram'] for u, o in users.items() if o and 'telegram' in o}
+        self.names = {u: display_name(u) for u in users}
+        self.channels = tuple(self.get('T_CHANNELS') or ())
+        self.webhooks = tuple(self.get('D_WEBHOOKS') or ())
+        # lobby-name vocabulary, NAMES from config.yml after the built-in adjectives
+        self.words = tuple(dict.fromkeys(ADJECTIVES + tuple(self.get('NAMES') or ())))
+
+
+    def display(self, user):
+        name = self.names.get(user)
+        return name if name is not None else display_name(user)
+
+
+_CONFIGS = {}
+
+
+def load_config(path=None):
+    # cached per process, only re-parsed when the file's mtime changes
+    path = path or os.environ.get('MUTANTS_CONFIG', 'config.yml')
+    mtime = os.stat(path).st_mtime_ns
+    cached = _CONFIGS.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    import yaml
+    with open(path, 'r') as cfg:
         try:
-            return yaml.safe_load(cfg)
+            config = Config(yaml.safe_load(cfg))
         except yaml.YAMLError as exc:
             print(exc)
+            return None
+    _CONFIGS[path] = (mtime, config)
+    return config
+
+
+ADJECTIVES = (
+    'lean',
+    'ethereal',
+    'impolite',
+    'chilly',
+    'supreme',
+    'materialistic',
+    'daffy',
+    'measly',
+    'previous',
+    'apathetic',
+    'terrible',
+    'telling',
+    'screeching',
+    'ill',
+    'frequent',
+    'true',
+    'fallacious',
+    'wild',
+    'rare',
+    'infamous',
+    'tidy',
+    'tasty',
+    'cooing',
+    'entertaining',
+    'vulgar',
+    'milky',
+    'huge',
+    'unnatural',
+    'woebegone',
+    'marvelous',
+    'kaput',
+    'spotless',
+    'peaceful',
+    'fumbling',
+    'dangerous',
+    'big',
+    'waiting',
+    'dead',
+    'bawdy',
+    'polite',
+    'squeamish',
+    'empty',
+    'easy',
+    'drunk',
+    'closed',
+    'damp',
+    'wiry',
+    'cloudy',
+    'plastic',
+    'valuable',
+    'aggressive',
+    'rotten',
+    'hesitant',
+    'hollow',
+    'powerful',
+    'truthful',
+    'historical',
+    'addicted',
+    'super',
+    'thinkable',
+    'debonair',
+    'lowly',
+    'marked',
+    'outrageous',
+    'lazy',
+    'quiet',
+    'insidious',
+    'wealthy',
+    'mushy',
+    'forgetful',
+    'wry',
+    'next',
+    'jazzy',
+    'raspy',
+    'meek',
+    'tangible',
+    'motionless',
+    'disgusting',
+    'bloody',
+    'scintillating',
+    'nutritious',
+    'lackadaisical',
+    'elastic',
+    'rigid',
+    'well',
+    'tremendous',
+    'abrasive',
+    'magnificent',
+    'striped',
+    'false',
+    'colorful',
+    'ruddy',
+    'obnoxious',
+    'careless',
+    'robust',
+    'future',
+    'foamy',
+    'perfect',
+    'numerous',
+    'ultra',
+    'bad',
+    'racial',
+    'receptive',
+    'ubiquitous',
+    'bustling',
+    'puffy',
+    'pointless',
+    'flawless',
+    'scary',
+    'elated',
+    'vacuous',
+    'married',
+    'healthy',
+    'nippy',
+    'steady',
+    'hulking',
+    'unaccountable',
+    'kindly',
+    'minor',
+    'second',
+    'necessary',
+    'hungry',
+    'vigorous',
+    'large',
+    'quizzical',
+    'intelligent',
+    'five',
+    'fretful',
+    'aback',
+    'disillusioned',
+    'crazy',
+    'nifty',
+    'fanatical',
+    'nice',
+    'unique',
+    'frightening',
+    'cut',
+    'faithful',
+    'young',
+    'white',
+    'conscious',
+    'cheap',
+    'lumpy',
+    'venomous',
+    'clear',
+    'scattered',
+    'new',
+    'direful',
+    'clean',
+    'busy',
+    'narrow',
+    'recondite',
+    'spurious',
+    'cooperative',
+    'ruthless',
+    'excited',
+    'excellent',
+    'halting',
+    'frightened',
+    'calm',
+    'gratis',
+    'safe',
+    'skillful',
+    'momentous',
+    'full',
+    'verdant',
+    'flowery',
+    'beautiful',
+    'eight',
+    'aloof',
+    'broken',
+    'rebel',
+    'inquisitive',
+    'painful',
+    'abaft',
+    'unsuitable',
+    'devilish',
+    'homeless',
+    'grandiose',
+    'offbeat',
+    'premium',
+    'various',
+    'yielding',
+    'tiny',
+    'bite',
+    'beneficial',
+    'splendid',
+    'probable',
+    'courageous',
+    'abject',
+    'elegant',
+    'gullible',
+    'whimsical',
+    'average',
+    'noxious',
+    'threatening',
+    'glorious',
+    'nostalgic',
+    'equal',
+    'vengeful',
+    'gruesome',
+    'needy',
+    'therapeutic',
+    'aberrant',
+    'uptight',
+    'smiling',
+    'chief',
+    'friendly',
+    'soft',
+    'modern',
+    'abortive',
+    'shy',
+    'determined',
+    'internal',
+    'enchanting',
+    'mellow',
+    'dark',
+    'hanging',
+    'high',
+    'bent',
+    'sharp',
+    'remarkable',
+    'belligerent',
+    'observant',
+    'four',
+    'acrid',
+    'cool',
+    'maddening',
+    'separate',
+    'furtive',
+    'windy',
+    'pink',
+    'watery',
+    'nonstop',
+    'psychedelic',
+    'abiding',
+    'rich',
+    'juicy',
+    'lively',
+    'sordid',
+    'tender',
+    'barbarous',
+    'icky',
+    'living',
+    'funny',
+    'lamentable',
+    'fascinated',
+    'pleasant',
+    'tame',
+    'heady',
+    'blue',
+    'messy',
+    'ratty',
+    'fixed',
+    'foregoing',
+    'imported',
+    'quarrelsome',
+    'whole',
+    'crowded',
+    'past',
+    'jolly',
+    'omniscient',
+    'adamant',
+    'feeble',
+    'puny',
+    'helpful',
+    'wholesale',
+    'alleged',
+    'enormous',
+    'salty',
+    'capricious',
+    'sulky',
+    'wonderful',
+    'hysterical',
+    'chemical',
+    'lonely',
+    'long',
+    'roasted',
+    'tedious',
+    'defiant',
+    'female',
+    'frail',
+    'superficial',
+    'tightfisted',
+    'petite',
+    'judicious',
+    'defeated',
+    'meaty',
+    'lucky',
+    'calculating',
+    'righteous',
+    'deep',
+    'resolute',
+    'naughty',
+    'squealing',
+    'ugly',
+    'bitter',
+    'godly',
+    'best',
+    'half',
+    'undesirable',
+    'energetic',
+    'disturbed',
+    'lush',
+    'illustrious',
+    'majestic',
+    'normal',
+    'exultant',
+    'disagreeable',
+    'harsh',
+    'glib',
+    'mountainous',
+    'six',
+    'natural',
+    'unbiased',
+    'deadpan',
+    'thin',
+    'tense',
+    'dysfunctional',
+    'electric',
+    'fluffy',
+    'accurate',
+    'lacking',
+    'cute',
+    'wooden',
+    'legal',
+    'overrated',
+    'harmonious',
+    'guttural',
+    'fragile',
+    'wrathful',
+    'knotty',
+    'earsplitting',
+    'noiseless',
+    'medical',
+    'unkempt',
+    'ancient',
+    'violent',
+    'tacit',
+    'mixed',
+    'greedy',
+    'unable',
+    'witty',
+    'nebulous',
+    'low',
+    'literate',
+    'slippery',
+    'whispering',
+    'panicky',
+    'highfalutin',
+    'exclusive',
+    'taboo',
+    'waggish',
+    'oceanic',
+    'aware',
+    'disgusted',
+    'berserk',
+    'dusty',
+    'icy',
+    'heavy',
+    'dynamic',
+    'solid',
+    'axiomatic',
+    'sneaky',
+    'cautious',
+    'didactic',
+    'afraid',
+    'clammy',
+    'soggy',
+    'impartial',
+    'stale',
+    'workable',
+    'material',
+    'animated',
+    'untidy',
+    'pricey',
+    'testy',
+    'parsimonious',
+    'numberless',
+    'giant',
+    'purple',
+    'freezing',
+    'macabre',
+    'malicious',
+    'gusty',
+    'good',
+    'innate',
+    'lavish',
+    'evasive',
+    'hideous',
+    'zippy',
+    'overwrought',
+    'small',
+    'damaging',
+    'fuzzy',
+    'hospitable',
+    'confused',
+    'useful',
+    'knowledgeable',
+    'public',
+    'gaudy',
+    'troubled',
+    'better',
+    'little',
+    'sweltering',
+    'descriptive',
+    'aboard',
+    'gleaming',
+    'chunky',
+    'greasy',
+    'spicy',
+    'quixotic',
+    'mere',
+    'opposite',
+    'permissible',
+    'skinny',
+    'truculent',
+    'quickest',
+    'redundant',
+    'obscene',
+    'erratic',
+    'delightful',
+    'mammoth',
+    'wanting',
+    'general',
+    'inexpensive',
+    'brown',
+    'alike',
+    'misty',
+    'oval',
+    'furry',
+    'nutty',
+    'optimal',
+    'nervous',
+    'poor',
+    'bashful',
+    'unwritten',
+    'efficacious',
+    'understood',
+    'rapid',
+    'mature',
+    'possible',
+    'three',
+    'green',
+    'wakeful',
+    'actually',
+    'madly',
+    'alcoholic',
+    'far',
+    'null',
+    'blushing',
+    'piquant',
+    'hellish',
+    'awesome',
+    'cold',
+    'cumbersome',
+    'nappy',
+    'stereotyped',
+    'absorbing',
+    'educated',
+    'jobless',
+    'willing',
+    'enthusiastic',
+    'tacky',
+    'rural',
+    'tall',
+    'stimulating',
+    'youthful',
+    'hapless',
+    'adaptable',
+    'amused',
+    'standing',
+    'helpless',
+    'rude',
+    'important',
+    'shiny',
+    'needless',
+    'cagey',
+    'alive',
+    'panoramic',
+    'square',
+    'terrific',
+    'subdued',
+    'free',
+    'thick',
+    'unadvised',
+    'slimy',
+    'subsequent',
+    'strong',
+    'somber',
+    'festive',
+    'breakable',
+    'dramatic',
+    'brash',
+    'ludicrous',
+    'sedate',
+    'hurt',
+    'prickly',
+    'vivacious',
+    'same',
+    'keen',
+    'sour',
+    'seemly',
+    'relieved',
+    'moaning',
+    'spiteful',
+    'angry',
+    'parallel',
+    'utter',
+    'versed',
+    'black',
+    'flashy',
+    'gigantic',
+    'diligent',
+    'quirky',
+    'silent',
+    'weary',
+    'early',
+    'rightful',
+    'two',
+    'complete',
+    'hateful',
+    'curly',
+    'massive',
+    'boring',
+    'finicky',
+    'concerned',
+    'foolish',
+    'spiky',
+    'unbecoming',
+    'neat',
+    'lovely',
+    'succinct',
+    'jumbled',
+    'silly',
+    'ready',
+    'overconfident',
+    'changeable',
+    'adventurous',
+    'ahead',
+    'reflective',
+    'fortunate',
+    'amazing',
+    'tight',
+    'ad',
+    'grotesque',
+    'neighborly',
+    'billowy',
+    'bumpy',
+    'organic',
+    'selective',
+    'penitent',
+    'wicked',
+    'smooth',
+    'special',
+    'light',
+    'obsequious',
+    'erect',
+    'smoggy',
+    'absurd',
+    'boorish',
+    'honorable',
+    'staking',
+    'hallowed',
+    'giddy',
+    'alert',
+    'orange',
+    'awful',
+    'economic',
+    'talented',
+    'dizzy',
+    'ambitious',
+    'uninterested',
+    'grubby',
+    'pretty',
+    'callous',
+    'wrong',
+    'nonchalant',
+    'muddled',
+    'deeply',
+    'uttermost',
+    'fair',
+    'thankful',
+    'impossible',
+    'warlike',
+    'voracious',
+    'questionable',
+    'dull',
+    'psychotic',
+    'first',
+    'adhesive',
+    'productive',
+    'irate',
+    'damaged',
+    'wacky',
+    'burly',
+    'great',
+    'dapper',
+    'automatic',
+    'domineering',
+    'quack',
+    'bizarre',
+    'zonked',
+    'sore',
+    'childlike',
+    'breezy',
+    'trashy',
+    'sloppy',
+    'tasteful',
+    'makeshift',
+    'teeny',
+    'imperfect',
+    'divergent',
+    'loutish',
+    'lyrical',
+    'onerous',
+    'uneven',
+    'toothsome',
+    'alluring',
+    'purring',
+    'selfish',
+    'doubtful',
+    'few',
+    'grouchy',
+    'aquatic',
+    'third',
+    'elfin',
+    'boiling',
+    'decorous',
+    'draconian',
+    'ajar',
+    'fast',
+    'sleepy',
+    'attractive',
+    'zesty',
+    'tricky',
+    'crooked',
+    'successful',
+    'old',
+    'late',
+    'imminent',
+    'lame',
+    'befitting',
+    'spotted',
+    'innocent',
+    'lethal',
+    'secret',
+    'sincere',
+    'scared',
+    'regular',
+    'proud',
+    'oafish',
+    'equable',
+    'weak',
+    'stingy',
+    'zany',
+    'abusive',
+    'overt',
+    'eminent',
+    'acid',
+    'tangy',
+    'outgoing',
+    'pale',
+    'shut',
+    'towering',
+    'protective',
+    'simple',
+    'worried',
+    'tough',
+    'short',
+    'coherent',
+    'rainy',
+    'shaggy',
+    'brief',
+    'abundant',
+    'temporary',
+    'even',
+    'shallow',
+    'horrible',
+    'nondescript',
+    'combative',
+    'rustic',
+    'tan',
+    'pastoral',
+    'amuck',
+    'functional',
+    'savory',
+    'immense',
+    'daily',
+    'bouncy',
+    'labored',
+    'ragged',
+    'shivering',
+    'absent',
+    'imaginary',
+    'wet',
+    'ordinary',
+    'pumped',
+    'unequaled',
+    'ambiguous',
+    'agreeable',
+    'roomy',
+    'abhorrent',
+    'idiotic',
+    'hard',
+    'humorous',
+    'trite',
+    'fat',
+    'thoughtless',
+    'interesting',
+    'military',
+    'unequal',
+    'spiritual',
+    'extra',
+    'dreary',
+    'eatable',
+    'placid',
+    'vague',
+    'open',
+    'plausible',
+    'defective',
+    'lying',
+    'demonic',
+    'flagrant',
+    'careful',
+    'mysterious',
+    'yummy',
+    'bored',
+    'happy',
+    'lewd',
+    'deafening',
+    'depressed',
+    'creepy',
+    'bright',
+    'spooky',
+    'phobic',
+    'rhetorical',
+    'annoying',
+    'grieving',
+    'guiltless',
+    'classy',
+    'ablaze',
+    'aromatic',
+    'right',
+    'endurable',
+    'gray',
+    'obtainable',
+    'certain',
+    'warm',
+    'vast',
+    'nimble',
+    'satisfying',
+    'repulsive',
+    'dependent',
+    'anxious',
+    'stormy',
+    'humdrum',
+    'ritzy',
+    'unknown',
+    'woozy',
+    'loud',
+    'sable',
+    'abandoned',
+    'upset',
+    'gifted',
+    'utopian',
+    'dear',
+    'broad',
+    'clumsy',
+    'condemned',
+    'colossal',
+    'grumpy',
+    'unwieldy',
+    'filthy',
+    'heartbreaking',
+    'stiff',
+    'cynical',
+    'irritating',
+    'macho',
+    'scarce',
+    'shaky',
+    'slow',
+    'exotic',
+    'tiresome',
+    'loose',
+    'kindhearted',
+    'glossy',
+    'yellow',
+    'chivalrous',
+    'flaky',
+    'rough',
+    'paltry',
+    'spotty',
+    'acceptable',
+    'limping',
+    'fierce',
+    'nine',
+    'jumpy',
+    'ignorant',
+    'rabid',
+    'grey',
+    'male',
+    'worthless',
+    'quaint',
+    'synonymous',
+    'dazzling',
+    'miniature',
+    'handsome',
+    'adjoining',
+    'obedient',
+    'mighty',
+    'tart',
+    'spectacular',
+    'puzzling',
+    'silky',
+    'feigned',
+    'inconclusive',
+    'unused',
+    'tenuous',
+    'incredible',
+    'illegal',
+    'acoustic',
+    'detailed',
+    'graceful',
+    'sassy',
+    'bewildered',
+    'scandalous',
+    'odd',
+    'lopsided',
+    'itchy',
+    'heavenly',
+    'jealous',
+    'left',
+    'aboriginal',
+    'wandering',
+    'possessive',
+    'snobbish',
+    'exuberant',
+    'melted',
+    'ripe',
+    'tested',
+    'jagged',
+    'magenta',
+    'goofy',
+    'romantic',
+    'difficult',
+    'elderly',
+    'flippant',
+    'nosy',
+    'present',
+    'guarded',
+    'frantic',
+    'accessible',
+    'groovy',
+    'real',
+    'common',
+    'incandescent',
+    'quick',
+    'coordinated',
+    'mute',
+    'gorgeous',
+    'boundless',
+    'unruly',
+    'swift',
+    'mean',
+    'last',
+    'delicate',
+    'auspicious',
+    'wiggly',
+    'unusual',
+    'rampant',
+    'delirious',
+    'unarmed',
+    'disastrous',
+    'fancy',
+    'political',
+    'annoyed',
+    'used',
+    'sick',
+    'ten',
+    'clever',
+    'flat',
+    'brainy',
+    'sudden',
+    'different',
+    'incompetent',
+    'charming',
+    'one',
+    'wistful',
+    'holistic',
+    'magical',
+    'sophisticated',
+    'acidic',
+    'curvy',
+    'faded',
+    'mindless',
+    'tired',
+    'abashed',
+    'cruel',
+    'elite',
+    'naive',
+    'faint',
+    'periodic',
+    'cheerful',
+    'straight',
+    'simplistic',
+    'arrogant',
+    'thoughtful',
+    'futuristic',
+    'awake',
+    'swanky',
+    'gabby',
+    'encouraging',
+    'available',
+    'fearful',
+    'noisy',
+    'handy',
+    'serious',
+    'slim',
+    'abounding',
+    'sticky',
+    'instinctive',
+    'responsible',
+    'wretched',
+    'luxuriant',
+    'fearless',
+    'superb',
+    'shrill',
+    'earthy',
+    'sweet',
+    'uppity',
+    'statuesque',
+    'astonishing',
+    'parched',
+    'miscreant',
+    'exciting',
+    'round',
+    'ossified',
+    'expensive',
+    'abstracted',
+    'curious',
+    'fresh',
+    'dashing',
+    'gainful',
+    'moldy',
+    'plant',
+    'snotty',
+    'flimsy',
+    'pathetic',
+    'fine',
+    'shocking',
+    'jaded',
+    'fantastic',
+    'laughable',
+    'stupid',
+    'hushed',
+    'vagabond',
+    'tearful',
+    'maniacal',
+    'agonizing',
+    'nauseating',
+    'outstanding',
+    'wise',
+    'aspiring',
+    'sparkling',
+    'able',
+    'like',
+    'painstaking',
+    'faulty',
+    'loving',
+    'handsomely',
+    'strange',
+    'hot',
+    'unsightly',
+    'complex',
+    'deranged',
+    'hypnotic',
+    'homely',
+    'discreet',
+    'unhealthy',
+    'dirty',
+    'learned',
+    'sturdy',
+    'crabby',
+    'precious',
+    'hissing',
+    'curved',
+    'sad',
+    'efficient',
+    'hurried',
+    'violet',
+    'wide',
+    'scientific',
+    'thirsty',
+    'cloistered',
+    'fluttering',
+    'squalid',
+    'amusing',
+    'assorted',
+    'overjoyed',
+    'gamy',
+    'hilarious',
+    'merciful',
+    'dispensable',
+    'substantial',
+    'glamorous',
+    'many',
+    'plucky',
+    'knowing',
+    'murky',
+    'evanescent',
+    'jittery',
+    'garrulous',
+    'juvenile',
+    'torpid',
+    'cowardly',
+    'upbeat',
+    'level',
+    'abnormal',
+    'obese',
+    'steadfast',
+    'rambunctious',
+    'puzzled',
+    'reminiscent',
+    'uncovered',
+    'absorbed',
+    'gentle',
+    'thundering',
+    'physical',
+    'voiceless',
+    'gaping',
+    'ceaseless',
+    'cuddly',
+    'volatile',
+    'husky',
+    'deserted',
+    'pushy',
+    'spiffy',
+    'adorable',
+    'zealous',
+    'steep',
+    'fabulous',
+    'womanly',
+    'envious',
+    'tasteless',
+    'wasteful',
+    'caring',
+    'melodic',
+    'drab',
+    'poised',
+    'victorious',
+    'grateful',
+    'private',
+    'distinct',
+    'obeisant',
+    'mundane',
+    'picayune',
+    'profuse',
+    'known',
+    'familiar',
+    'fertile',
+    'invincible',
+    'perpetual',
+    'royal',
+    'stupendous',
+    'joyous',
+    'craven',
+    'typical',
+    'red',
+    'useless',
+    'wary',
+    'kind',
+    'brawny',
+    'obsolete',
+    'enchanted',
+    'ugliest',
+    'tranquil',
+    'cultured',
+    'secretive',
+    'delicious',
+    'glistening',
+    'languid',
+    'nasty',
+    'symptomatic',
+    'accidental',
+    'resonant',
+    'dry',
+    'cluttered',
+    'habitual',
+    'comfortable',
+    'plain',
+    'scrawny',
+    'smelly',
+    'industrious',
+    'brave',
+    'decisive',
+    'abrupt',
+    'capable',
+    'likeable',
+    'chubby',
+    'tawdry',
+    'smart',
+    'embarrassed',
+    'longing',
+    'eager',
+    'near',
+    'famous',
+    'ashamed',
+)
+
+
+class LobbyNames:
+    # unique names for live lobbies, take() is O(1) via swap-remove on the free list
+    def __init__(self, words=ADJECTIVES, prefix='', suffix='-mutants'):
+        self.prefix = prefix
+        self.suffix = suffix
+        self.words = ()
+        self.seeded = False
+        self._words = set()
+        self._free = []
+        self._live = []  # heap of (expires, word)
+        self._lock = threading.Lock()
+        self.use(words)
+
+
+    def use(self, words):
+        # swaps the vocabulary, words dropped from it are not handed out again even once released
+        with self._lock:
+            live = {word for _, word in self._live}
+            self.words = words
+            self._words = set(words)
+            self._free = [word for word in words if word not in live]
+
+
+    def seed(self, names):
+        # marks (name, expires) pairs from storage as live, a restarted process forgets its own
+        with self._lock:
+            for name, expires in names:
+                word = name[len(self.prefix):len(name) - len(self.suffix)]
+                if word in self._words and word in self._free:
+                    self._free.remove(word)
+                    heapq.heappush(self._live, (expires, word))
+            self.seeded = True
+
+
+    def _release_expired(self, now):
+        while self._live and self._live[0][0] <= now:
+            word = heapq.heappop(self._live)[1]
+            if word in self._words:
+                self._free.append(word)
+
+
+    def take(self, expires):
+        with self._lock:
+            self._release_expired(time.time())
+            if not self._free:
+                # every word is in use, fall back to a numbered name
+                return self.prefix + secrets.choice(self.words) + f'-{secrets.randbelow(1000)}' + self.suffix
+            i = secrets.randbelow(len(self._free))
+            self._free[i], self._free[-1] = self._free[-1], self._free[i]
+            word = self._free.pop()
+            heapq.heappush(self._live, (expires, word))
+            return self.prefix + word + self.suffix
 
 
-def rand_lobby_name(prefix='', suffix='-mutants'):
-    adjectives = [
-        'lean',
-        'ethereal',
-        'impolite',
-        'chilly',
-        'supreme',
-        'materialistic',
-        'daffy',
-        'measly',
-        'previous',
-        'apathetic',
-        'terrible',
-        'telling',
-        'screeching',
-        'ill',
-        'frequent',
-        'true',
-        'fallacious',
-        'wild',
-        'rare',
-        'infamous',
-        'tidy',
-        'tasty',
-        'cooing',
-        'entertaining',
-        'vulgar',
-        'milky',
-        'huge',
-        'unnatural',
-        'woebegone',
-        'marvelous',
-        'kaput',
-        'spotless',
-        'peaceful',
-        'fumbling',
-        'dangerous',
-        'big',
-        'waiting',
-        'dead',
-        'bawdy',
-        'polite',
-        'squeamish',
-        'empty',
-        'easy',
-        'drunk',
-        'closed',
-        'damp',
-        'wiry',
-        'cloudy',
-        'plastic',
-        'valuable',
-        'aggressive',
-        'rotten',
-        'hesitant',
-        'hollow',
-        'powerful',
-        'truthful',
-        'historical',
-        'addicted',
-        'super',
-        'thinkable',
-        'debonair',
-        'lowly',
-        'marked',
-        'outrageous',
-        'lazy',
-        'quiet',
-        'insidious',
-        'wealthy',
-        'mushy',
-        'forgetful',
-        'wry',
-        'next',
-        'jazzy',
-        'raspy',
-        'meek',
-        'tangible',
-        'motionless',
-        'disgusting',
-        'bloody',
-        'scintillating',
-        'nutritious',
-        'lackadaisical',
-        'elastic',
-        'rigid',
-        'well',
-        'tremendous',
-        'abrasive',
-        'magnificent',
-        'striped',
-        'false',
-        'colorful',
-        'ruddy',
-        'obnoxious',
-        'careless',
-        'robust',
-        'future',
-        'foamy',
-        'perfect',
-        'numerous',
-        'ultra',
-        'bad',
-        'racial',
-        'receptive',
-        'ubiquitous',
-        'bustling',
-        'puffy',
-        'pointless',
-        'flawless',
-        'scary',
-        'elated',
-        'vacuous',
-        'married',
-        'healthy',
-        'nippy',
-        'steady',
-        'hulking',
-        'unaccountable',
-        'kindly',
-        'minor',
-        'second',
-        'necessary',
-        'hungry',
-        'vigorous',
-        'large',
-        'quizzical',
-        'intelligent',
-        'five',
-        'fretful',
-        'aback',
-        'disillusioned',
-        'crazy',
-        'nifty',
-        'fanatical',
-        'nice',
-        'unique',
-        'frightening',
-        'cut',
-        'faithful',
-        'young',
-        'white',
-        'conscious',
-        'cheap',
-        'lumpy',
-        'venomous',
-        'clear',
-        'scattered',
-        'new',
-        'direful',
-        'clean',
-        'busy',
-        'narrow',
-        'recondite',
-        'spurious',
-        'cooperative',
-        'ruthless',
-        'excited',
-        'excellent',
-        'halting',
-        'frightened',
-        'calm',
-        'gratis',
-        'safe',
-        'skillful',
-        'momentous',
-        'full',
-        'verdant',
-        'flowery',
-        'beautiful',
-        'eight',
-        'aloof',
-        'broken',
-        'rebel',
-        'inquisitive',
-        'painful',
-        'abaft',
-        'unsuitable',
-        'devilish',
-        'homeless',
-        'grandiose',
-        'offbeat',
-        'premium',
-        'various',
-        'yielding',
-        'tiny',
-        'bite',
-        'beneficial',
-        'splendid',
-        'probable',
-        'courageous',
-        'abject',
-        'elegant',
-        'gullible',
-        'whimsical',
-        'average',
-        'noxious',
-        'threatening',
-        'glorious',
-        'nostalgic',
-        'equal',
-        'vengeful',
-        'gruesome',
-        'needy',
-        'therapeutic',
-        'aberrant',
-        'uptight',
-        'smiling',
-        'chief',
-        'friendly',
-        'soft',
-        'modern',
-        'abortive',
-        'shy',
-        'determined',
-        'internal',
-        'enchanting',
-        'mellow',
-        'dark',
-        'hanging',
-        'high',
-        'bent',
-        'sharp',
-        'remarkable',
-        'belligerent',
-        'observant',
-        'four',
-        'acrid',
-        'cool',
-        'maddening',
-        'separate',
-        'furtive',
-        'windy',
-        'pink',
-        'watery',
-        'nonstop',
-        'psychedelic',
-        'abiding',
-        'rich',
-        'juicy',
-        'lively',
-        'sordid',
-        'tender',
-        'barbarous',
-        'icky',
-        'living',
-        'funny',
-        'lamentable',
-        'fascinated',
-        'pleasant',
-        'tame',
-        'heady',
-        'blue',
-        'messy',
-        'ratty',
-        'fixed',
-        'foregoing',
-        'imported',
-        'quarrelsome',
-        'whole',
-        'crowded',
-        'past',
-        'jolly',
-        'omniscient',
-        'adamant',
-        'feeble',
-        'puny',
-        'helpful',
-        'wholesale',
-        'alleged',
-        'enormous',
-        'salty',
-        'capricious',
-        'sulky',
-        'wonderful',
-        'hysterical',
-        'chemical',
-        'lonely',
-        'long',
-        'roasted',
-        'tedious',
-        'defiant',
-        'female',
-        'frail',
-        'superficial',
-        'tightfisted',
-        'petite',
-        'judicious',
-        'defeated',
-        'meaty',
-        'lucky',
-        'calculating',
-        'righteous',
-        'deep',
-        'resolute',
-        'naughty',
-        'squealing',
-        'ugly',
-        'bitter',
-        'godly',
-        'best',
-        'half',
-        'undesirable',
-        'energetic',
-        'disturbed',
-        'lush',
-        'illustrious',
-        'majestic',
-        'normal',
-        'exultant',
-        'disagreeable',
-        'harsh',
-        'lively',
-        'glib',
-        'mountainous',
-        'six',
-        'natural',
-        'unbiased',
-        'deadpan',
-        'thin',
-        'tense',
-        'dysfunctional',
-        'electric',
-        'fluffy',
-        'accurate',
-        'lacking',
-        'cute',
-        'wooden',
-        'legal',
-        'overrated',
-        'harmonious',
-        'guttural',
-        'fragile',
-        'wrathful',
-        'knotty',
-        'earsplitting',
-        'noiseless',
-        'medical',
-        'unkempt',
-        'ancient',
-        'violent',
-        'tacit',
-        'mixed',
-        'greedy',
-        'unable',
-        'witty',
-        'nebulous',
-        'low',
-        'literate',
-        'slippery',
-        'whispering',
-        'panicky',
-        'highfalutin',
-        'exclusive',
-        'taboo',
-        'waggish',
-        'oceanic',
-        'aware',
-        'disgusted',
-        'berserk',
-        'dusty',
-        'second',
-        'icy',
-        'heavy',
-        'dynamic',
-        'solid',
-        'axiomatic',
-        'sneaky',
-        'cautious',
-        'didactic',
-        'afraid',
-        'clammy',
-        'soggy',
-        'impartial',
-        'stale',
-        'workable',
-        'material',
-        'animated',
-        'untidy',
-        'pricey',
-        'testy',
-        'parsimonious',
-        'numberless',
-        'giant',
-        'purple',
-        'freezing',
-        'macabre',
-        'malicious',
-        'gusty',
-        'good',
-        'innate',
-        'lavish',
-        'evasive',
-        'hideous',
-        'zippy',
-        'overwrought',
-        'small',
-        'damaging',
-        'fuzzy',
-        'hospitable',
-        'confused',
-        'useful',
-        'knowledgeable',
-        'public',
-        'gaudy',
-        'troubled',
-        'better',
-        'little',
-        'sweltering',
-        'descriptive',
-        'aboard',
-        'gleaming',
-        'chunky',
-        'greasy',
-        'spicy',
-        'quixotic',
-        'tense',
-        'mere',
-        'opposite',
-        'permissible',
-        'skinny',
-        'truculent',
-        'quickest',
-        'redundant',
-        'obscene',
-        'erratic',
-        'delightful',
-        'mammoth',
-        'wanting',
-        'general',
-        'inexpensive',
-        'brown',
-        'alike',
-        'misty',
-        'oval',
-        'furry',
-        'nutty',
-        'optimal',
-        'nervous',
-        'poor',
-        'bashful',
-        'unwritten',
-        'efficacious',
-        'understood',
-        'rapid',
-        'mature',
-        'possible',
-        'three',
-        'green',
-        'wakeful',
-        'actually',
-        'madly',
-        'alcoholic',
-        'far',
-        'null',
-        'blushing',
-        'piquant',
-        'hellish',
-        'awesome',
-        'cold',
-        'cumbersome',
-        'nappy',
-        'stereotyped',
-        'absorbing',
-        'educated',
-        'jobless',
-        'willing',
-        'enthusiastic',
-        'tacky',
-        'rural',
-        'tall',
-        'stimulating',
-        'youthful',
-        'hapless',
-        'adaptable',
-        'amused',
-        'standing',
-        'helpless',
-        'rude',
-        'important',
-        'shiny',
-        'needless',
-        'cagey',
-        'alive',
-        'panoramic',
-        'square',
-        'terrific',
-        'subdued',
-        'free',
-        'thick',
-        'unadvised',
-        'slimy',
-        'subsequent',
-        'strong',
-        'somber',
-        'festive',
-        'breakable',
-        'dramatic',
-        'brash',
-        'ludicrous',
-        'sedate',
-        'hurt',
-        'prickly',
-        'vivacious',
-        'same',
-        'keen',
-        'sour',
-        'seemly',
-        'relieved',
-        'moaning',
-        'spiteful',
-        'angry',
-        'parallel',
-        'utter',
-        'versed',
-        'black',
-        'dusty',
-        'flashy',
-        'gigantic',
-        'diligent',
-        'quirky',
-        'silent',
-        'weary',
-        'early',
-        'rightful',
-        'two',
-        'complete',
-        'hateful',
-        'curly',
-        'massive',
-        'boring',
-        'finicky',
-        'concerned',
-        'foolish',
-        'spiky',
-        'unbecoming',
-        'neat',
-        'lovely',
-        'succinct',
-        'jumbled',
-        'silly',
-        'ready',
-        'overconfident',
-        'changeable',
-        'adventurous',
-        'ahead',
-        'reflective',
-        'fortunate',
-        'amazing',
-        'tight',
-        'ad',
-        'grotesque',
-        'neighborly',
-        'billowy',
-        'bumpy',
-        'organic',
-        'selective',
-        'penitent',
-        'wicked',
-        'smooth',
-        'special',
-        'light',
-        'obsequious',
-        'erect',
-        'smoggy',
-        'absurd',
-        'boorish',
-        'honorable',
-        'staking',
-        'hallowed',
-        'giddy',
-        'alert',
-        'orange',
-        'awful',
-        'economic',
-        'talented',
-        'dizzy',
-        'ambitious',
-        'uninterested',
-        'grubby',
-        'pretty',
-        'callous',
-        'wrong',
-        'nonchalant',
-        'muddled',
-        'deeply',
-        'uttermost',
-        'fair',
-        'thankful',
-        'impossible',
-        'warlike',
-        'voracious',
-        'questionable',
-        'dull',
-        'psychotic',
-        'first',
-        'adhesive',
-        'productive',
-        'irate',
-        'damaged',
-        'wacky',
-        'burly',
-        'great',
-        'dapper',
-        'automatic',
-        'domineering',
-        'quack',
-        'bizarre',
-        'zonked',
-        'sore',
-        'childlike',
-        'breezy',
-        'trashy',
-        'sloppy',
-        'tasteful',
-        'makeshift',
-        'teeny',
-        'imperfect',
-        'divergent',
-        'loutish',
-        'lyrical',
-        'onerous',
-        'uneven',
-        'toothsome',
-        'alluring',
-        'purring',
-        'selfish',
-        'doubtful',
-        'few',
-        'grouchy',
-        'aquatic',
-        'blue',
-        'sore',
-        'third',
-        'elfin',
-        'boiling',
-        'decorous',
-        'draconian',
-        'ajar',
-        'fast',
-        'sleepy',
-        'attractive',
-        'zesty',
-        'tricky',
-        'crooked',
-        'successful',
-        'old',
-        'late',
-        'imminent',
-        'lame',
-        'befitting',
-        'spotted',
-        'innocent',
-        'lethal',
-        'secret',
-        'sincere',
-        'scared',
-        'regular',
-        'proud',
-        'oafish',
-        'equable',
-        'weak',
-        'stingy',
-        'zany',
-        'abusive',
-        'overt',
-        'eminent',
-        'acid',
-        'tangy',
-        'outgoing',
-        'pale',
-        'shut',
-        'towering',
-        'protective',
-        'simple',
-        'worried',
-        'tough',
-        'short',
-        'coherent',
-        'rainy',
-        'shaggy',
-        'brief',
-        'abundant',
-        'temporary',
-        'even',
-        'shallow',
-        'horrible',
-        'nondescript',
-        'combative',
-        'rustic',
-        'tan',
-        'pastoral',
-        'amuck',
-        'functional',
-        'savory',
-        'immense',
-        'daily',
-        'bouncy',
-        'labored',
-        'ragged',
-        'shivering',
-        'absent',
-        'imaginary',
-        'wet',
-        'ordinary',
-        'pumped',
-        'unequaled',
-        'ambiguous',
-        'agreeable',
-        'roomy',
-        'abhorrent',
-        'idiotic',
-        'hard',
-        'humorous',
-        'trite',
-        'fat',
-        'thoughtless',
-        'interesting',
-        'military',
-        'unequal',
-        'spiritual',
-        'extra',
-        'dreary',
-        'eatable',
-        'placid',
-        'vague',
-        'open',
-        'plausible',
-        'defective',
-        'lying',
-        'demonic',
-        'flagrant',
-        'careful',
-        'mysterious',
-        'yummy',
-        'bored',
-        'happy',
-        'lewd',
-        'deafening',
-        'depressed',
-        'creepy',
-        'bright',
-        'spooky',
-        'phobic',
-        'rhetorical',
-        'annoying',
-        'grieving',
-        'guiltless',
-        'classy',
-        'ablaze',
-        'aromatic',
-        'right',
-        'endurable',
-        'gray',
-        'obtainable',
-        'certain',
-        'warm',
-        'vast',
-        'nimble',
-        'satisfying',
-        'repulsive',
-        'dependent',
-        'anxious',
-        'stormy',
-        'humdrum',
-        'ritzy',
-        'unknown',
-        'woozy',
-        'loud',
-        'sable',
-        'bright',
-        'ill',
-        'abandoned',
-        'upset',
-        'gifted',
-        'utopian',
-        'dear',
-        'broad',
-        'well',
-        'clumsy',
-        'condemned',
-        'colossal',
-        'grumpy',
-        'unwieldy',
-        'silent',
-        'filthy',
-        'heartbreaking',
-        'stiff',
-        'cynical',
-        'irritating',
-        'macho',
-        'scarce',
-        'shaky',
-        'well',
-        'slow',
-        'exotic',
-        'tiresome',
-        'loose',
-        'kindhearted',
-        'glossy',
-        'yellow',
-        'chivalrous',
-        'flaky',
-        'rough',
-        'paltry',
-        'spotty',
-        'acceptable',
-        'limping',
-        'fierce',
-        'nine',
-        'petite',
-        'jumpy',
-        'ignorant',
-        'rabid',
-        'grey',
-        'male',
-        'worthless',
-        'quaint',
-        'synonymous',
-        'dazzling',
-        'miniature',
-        'well',
-        'handsome',
-        'adjoining',
-        'obedient',
-        'mighty',
-        'tart',
-        'long',
-        'spectacular',
-        'puzzling',
-        'silky',
-        'feigned',
-        'inconclusive',
-        'unused',
-        'tenuous',
-        'incredible',
-        'illegal',
-        'acoustic',
-        'detailed',
-        'graceful',
-        'sassy',
-        'bewildered',
-        'scandalous',
-        'odd',
-        'teeny',
-        'lopsided',
-        'itchy',
-        'heavenly',
-        'jealous',
-        'left',
-        'aboriginal',
-        'wandering',
-        'possessive',
-        'snobbish',
-        'exuberant',
-        'melted',
-        'ripe',
-        'tested',
-        'jagged',
-        'magenta',
-        'goofy',
-        'romantic',
-        'difficult',
-        'elderly',
-        'flippant',
-        'nosy',
-        'present',
-        'guarded',
-        'frantic',
-        'accessible',
-        'groovy',
-        'real',
-        'common',
-        'incandescent',
-        'quick',
-        'coordinated',
-        'mute',
-        'gorgeous',
-        'boundless',
-        'unruly',
-        'swift',
-        'mean',
-        'last',
-        'delicate',
-        'auspicious',
-        'wiggly',
-        'unusual',
-        'rampant',
-        'delirious',
-        'unarmed',
-        'disastrous',
-        'fancy',
-        'political',
-        'annoyed',
-        'used',
-        'sick',
-        'ten',
-        'clever',
-        'flat',
-        'brainy',
-        'sudden',
-        'different',
-        'incompetent',
-        'charming',
-        'one',
-        'wistful',
-        'holistic',
-        'magical',
-        'sophisticated',
-        'acidic',
-        'curvy',
-        'faded',
-        'mindless',
-        'ill',
-        'tired',
-        'abashed',
-        'cruel',
-        'elite',
-        'naive',
-        'faint',
-        'periodic',
-        'cheerful',
-        'straight',
-        'simplistic',
-        'arrogant',
-        'thoughtful',
-        'futuristic',
-        'awake',
-        'swanky',
-        'gabby',
-        'encouraging',
-        'available',
-        'fearful',
-        'noisy',
-        'handy',
-        'serious',
-        'slim',
-        'abounding',
-        'sticky',
-        'instinctive',
-        'responsible',
-        'wretched',
-        'luxuriant',
-        'fearless',
-        'superb',
-        'shrill',
-        'earthy',
-        'sweet',
-        'uppity',
-        'statuesque',
-        'far',
-        'astonishing',
-        'parched',
-        'miscreant',
-        'exciting',
-        'round',
-        'ossified',
-        'expensive',
-        'abstracted',
-        'curious',
-        'fresh',
-        'dashing',
-        'extra',
-        'gainful',
-        'moldy',
-        'plant',
-        'snotty',
-        'flimsy',
-        'pathetic',
-        'fine',
-        'shocking',
-        'cute',
-        'jaded',
-        'fantastic',
-        'laughable',
-        'stupid',
-        'hushed',
-        'vagabond',
-        'tearful',
-        'maniacal',
-        'agonizing',
-        'nauseating',
-        'outstanding',
-        'wise',
-        'aspiring',
-        'sparkling',
-        'able',
-        'like',
-        'painstaking',
-        'faulty',
-        'loving',
-        'handsomely',
-        'strange',
-        'hot',
-        'unsightly',
-        'complex',
-        'deranged',
-        'hypnotic',
-        'homely',
-        'discreet',
-        'unhealthy',
-        'dirty',
-        'learned',
-        'sturdy',
-        'crabby',
-        'precious',
-        'hissing',
-        'curved',
-        'sad',
-        'efficient',
-        'hard',
-        'hurried',
-        'violet',
-        'wide',
-        'scientific',
-        'thirsty',
-        'cloistered',
-        'fluttering',
-        'squalid',
-        'amusing',
-        'assorted',
-        'overjoyed',
-        'old',
-        'gamy',
-        'hilarious',
-        'merciful',
-        'dispensable',
-        'substantial',
-        'glamorous',
-        'many',
-        'plucky',
-        'knowing',
-        'murky',
-        'evanescent',
-        'jittery',
-        'garrulous',
-        'juvenile',
-        'torpid',
-        'cowardly',
-        'upbeat',
-        'level',
-        'abnormal',
-        'obese',
-        'steadfast',
-        'rambunctious',
-        'puzzled',
-        'reminiscent',
-        'uncovered',
-        'absorbed',
-        'gentle',
-        'thundering',
-        'physical',
-        'voiceless',
-        'gaping',
-        'ceaseless',
-        'cuddly',
-        'volatile',
-        'husky',
-        'thirsty',
-        'deserted',
-        'pushy',
-        'spiffy',
-        'adorable',
-        'zealous',
-        'steep',
-        'fabulous',
-        'womanly',
-        'envious',
-        'tasteless',
-        'wasteful',
-        'caring',
-        'melodic',
-        'drab',
-        'poised',
-        'victorious',
-        'grateful',
-        'private',
-        'distinct',
-        'obeisant',
-        'mundane',
-        'picayune',
-        'profuse',
-        'known',
-        'familiar',
-        'fertile',
-        'invincible',
-        'perpetual',
-        'royal',
-        'stupendous',
-        'joyous',
-        'craven',
-        'typical',
-        'red',
-        'useless',
-        'wary',
-        'kind',
-        'brawny',
-        'obsolete',
-        'enchanted',
-        'ugliest',
-        'tranquil',
-        'cultured',
-        'secretive',
-        'delicious',
-        'glistening',
-        'languid',
-        'nasty',
-        'symptomatic',
-        'accidental',
-        'resonant',
-        'dry',
-        'cluttered',
-        'habitual',
-        'comfortable',
-        'plain',
-        'scrawny',
-        'smelly',
-        'industrious',
-        'brave',
-        'decisive',
-        'abrupt',
-        'capable',
-        'likeable',
-        'chubby',
-        'tawdry',
-        'smart',
-        'embarrassed',
-        'longing',
-        'eager',
-        'high',
-        'wide',
-        'near',
-        'famous',
-        'ashamed'
-    ]
-    return prefix + secrets.choice(adjectives) + suffix
+LOBBY_NAMES = LobbyNames()
@@ -0,0 +1,296 @@
+import time
+import threading
+from urllib.parse import urlsplit
+from metrics import timed
+
+
+class Later(Exception):
+    # raised by a dispatcher task that can't go out yet, the dispatcher runs it again after delay seconds
+    def __init__(self, delay):
+        self.delay = delay
+
+
+class Dispatcher:
+    # bounded worker pool for outbound notifications
+    def __init__(self, workers=8):
+        self.workers = workers
+        self.max_delay = None  # cap on later()'s delay, lambda sets 0 since a frozen container runs no timers
+        self._pool = None
+        self._pending = set()
+        self._due = {}  # delayed futures -> monotonic time of their next run
+        self._owners = {}  # pending futures -> thread that queued them, or whose task did
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)  # a task finished or was rescheduled
+
+
+    def _executor(self):
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    from concurrent.futures import ThreadPoolExecutor
+                    self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='notify')
+        return self._pool
+
+
+    def resize(self, workers):
+        # later tasks go to a pool of the new size, running ones finish on the old pool
+        with self._lock:
+            pool, self._pool, self.workers = self._pool, None, workers
+        if pool is not None:
+            pool.shutdown(wait=False)
+
+
+    def _owner(self):
+        # work queued by a task belongs to whoever queued the task
+        return getattr(self._local, 'owner', None) or threading.get_ident()
+
+
+    def _start(self, future, fn, args, kwargs):
+        with self._lock:
+            self._due.pop(future, None)
+        self._executor().submit(self._run, future, fn, args, kwargs)
+
+
+    def _delay(self, delay, future, fn, args, kwargs):
+        with self._lock:
+            self._due[future] = time.monotonic() + delay
+            self._changed.notify_all()
+        timer = threading.Timer(delay, self._start, (future, fn, args, kwargs))
+        timer.daemon = True
+        timer.start()
+
+
+    def _run(self, future, fn, args, kwargs):
+        with self._lock:
+            self._local.owner = self._owners.get(future)
+        try:
+            result = fn(*args, **kwargs)
+        except Later as e:
+            # back on a timer instead of sleeping, the worker moves on to the next task
+            self._delay(e.delay, future, fn, args, kwargs)
+            return
+        except Exception as e:
+            print(e)
+            result = None
+        finally:
+            self._local.owner = None
+        future.set_result(result)
+
+
+    def submit(self, fn, *args, **kwargs):
+        return self.later(0, fn, *args, **kwargs)
+
+
+    def later(self, delay, fn, *args, **kwargs):
+        # submit() after delay seconds, drain() treats it like any other queued task
+        if self.max_delay is not None:
+            delay = min(delay, self.max_delay)
+        return self._later(self._owner(), delay, fn, args, kwargs)
+
+
+    def _later(self, owner, delay, fn, args, kwargs):
+        from concurrent.futures import Future
+        future = Future()
+        with self._lock:
+            self._pending.add(future)
+            self._owners[future] = owner
+        future.add_done_callback(self._done)
+        if delay > 0:
+            self._delay(delay, future, fn, args, kwargs)
+        else:
+            self._start(future, fn, args, kwargs)
+        return future
+
+
+    def _done(self, future):
+        with self._lock:
+            self._pending.discard(future)
+            self._owners.pop(future, None)
+            self._changed.notify_all()
+
+
+    def after(self, futures, fn, *args):
+        # submits fn(*args) once every future in futures has finished, drain() waits for it too
+        from concurrent.futures import Future
+        if not futures:
+            return self.submit(fn, *args)
+        # the last future can finish on any thread, fn is queued for whoever called after()
+        owner = self._owner()
+        gate = Future()
+        with self._lock:
+            self._pending.add(gate)
+            self._owners[gate] = owner
+        gate.add_done_callback(self._done)
+        remaining = [len(futures)]
+        lock = threading.Lock()
+
+        def done(_):
+            with lock:
+                remaining[0] -= 1
+                last = remaining[0] == 0
+            if last:
+                try:
+                    self._later(owner, 0, fn, args, {})
+                finally:
+                    gate.set_result(None)
+
+        for future in futures:
+            future.add_done_callback(done)
+        return gate
+
+
+    def drain(self, timeout=None, mine=False):
+        # waits for everything queued, including work queued by running tasks,
+        # tasks delayed past the deadline are left on their timers.
+        # mine waits only for what the calling thread queued, one lambda invocation among others in the process
+        deadline = None if timeout is None else time.monotonic() + timeout
+        owner = self._owner() if mine else None
+        with self._changed:
+            while True:
+                if not any((deadline is None or self._due.get(f, 0) < deadline) and
+                           (owner is None or self._owners.get(f) == owner) for f in self._pending):
+                    return
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return
+                self._changed.wait(remaining)
+
+
+DISPATCHER = Dispatcher()
+
+
+class TokenBucket:
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._stamp = time.monotonic()
+        self._lock = threading.Lock()
+
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._stamp) * self.rate)
+        self._stamp = now
+
+
+    def ready_in(self):
+        # seconds until a whole token is available, 0 if one is available now
+        with self._lock:
+            self._refill()
+            return 0 if self._tokens >= 1 else (1 - self._tokens) / self.rate
+
+
+    def try_take(self):
+        # takes a token and returns 0, or leaves the bucket alone and returns the seconds until one is available
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0
+            return (1 - self._tokens) / self.rate
+
+
+    def give_back(self):
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + 1)
+
+
+def retry_after(exc):
+    # telebot.apihelper.ApiTelegramException for a 429, without importing telebot
+    if getattr(exc, 'error_code', None) != 429:
+        return None
+    params = (getattr(exc, 'result_json', None) or {}).get('parameters') or {}
+    return params.get('retry_after', 1)
+
+
+class TelegramSender:
+    # paces messages under telegram's global and per-chat limits, meant to run on a Dispatcher:
+    # an empty bucket or a 429 raises Later so the send is rescheduled instead of holding a worker
+    def __init__(self, bot, rate=30, chat_rate=1, group_rate=20 / 60):
+        self.bot = bot
+        self.chat_rate = chat_rate
+        self.group_rate = group_rate
+        self._global = TokenBucket(rate, rate)
+        self._chats = {}
+        self._lock = threading.Lock()
+
+
+    def _bucket(self, chat_id):
+        bucket = self._chats.get(chat_id)
+        if bucket is None:
+            with self._lock:
+                bucket = self._chats.get(chat_id)
+                if bucket is None:
+                    # negative ids are groups and channels, which telegram limits per minute
+                    group = str(chat_id).startswith(('-', '@'))
+                    bucket = self._chats[chat_id] = TokenBucket(self.group_rate if group else self.chat_rate)
+        return bucket
+
+
+    def pace(self, chat_id):
+        # advisory check for callers with work to do before sending, _call still takes the tokens atomically
+        wait = max(self._bucket(chat_id).ready_in(), self._global.ready_in())
+        if wait:
+            raise Later(wait)
+
+
+    def _take(self, chat_id):
+        # both tokens or neither, each check-and-take is atomic so concurrent workers can't all pass together
+        bucket = self._bucket(chat_id)
+        wait = bucket.try_take()
+        if wait:
+            raise Later(wait)
+        wait = self._global.try_take()
+        if wait:
+            bucket.give_back()
+            raise Later(wait)
+
+
+    def _call(self, method, chat_id, **kwargs):
+        self._take(chat_id)
+        try:
+            with timed(f'telegram.{method}'):
+                return getattr(self.bot, method)(chat_id=chat_id, **kwargs)
+        except Exception as e:
+            wait = retry_after(e)
+            if wait is None:
+                raise
+            raise Later(wait)
+
+
+    def send_message(self, text, chat_id, **kwargs):
+        return self._call('send_message', chat_id, text=text, **kwargs)
+
+
+    def edit_message_text(self, text, chat_id, message_id, **kwargs):
+        return self._call('edit_message_text', chat_id, text=text, message_id=message_id, **kwargs)
+
+
+class WebhookSender:
+    # one keep-alive session per webhook host, explicit timeouts and status checks,
+    # a 429 raises Later so the dispatcher retries after discord's retry_after
+    def __init__(self, session, timeout=(3.05, 10)):
+        self.session = session
+        self.timeout = timeout
+
+
+    def request(self, method, url, **kwargs):
+        host = urlsplit(url).netloc
+        kwargs.setdefault('timeout', self.timeout)
+        with timed(f'discord.{method.lower()}') as t:
+            r = self.session(host).request(method, url, **kwargs)
+            t.outcome = 'ok' if r.ok else str(r.status_code)
+        if r.status_code == 429:
+            raise Later(float(r.json().get('retry_after', 1)))
+        r.raise_for_status()
+        return r
+
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+
+    def patch(self, url, **kwargs):
+        return self.request('PATCH', url, **kwargs)
@@ -0,0 +1,133 @@
+import os
+import sys
+import time
+import random
+import threading
+import functools
+import collections
+
+# opt-in per-invocation profiles, MUTANTS_PROFILE_DIR turns it on,
+# MUTANTS_PROFILE_RATE is the fraction of invocations profiled (default all)
+SETTINGS = {
+    'dir': os.environ.get('MUTANTS_PROFILE_DIR'),
+    'rate': float(os.environ.get('MUTANTS_PROFILE_RATE', 1)),
+    'interval': float(os.environ.get('MUTANTS_PROFILE_INTERVAL', 0.001)),
+}
+_active = threading.Lock()
+_seq = collections.Counter()
+IDLE_FILES = ('threading.py', 'queue.py')
+CO_COROUTINE = 0x80  # inspect.CO_COROUTINE, without importing inspect on the lambda cold path
+
+
+def configure(dir=None, rate=None, interval=None):
+    # config.yml can enable profiling for the bot, env vars still win
+    if dir and not os.environ.get('MUTANTS_PROFILE_DIR'):
+        SETTINGS['dir'] = dir
+    if rate is not None and 'MUTANTS_PROFILE_RATE' not in os.environ:
+        SETTINGS['rate'] = float(rate)
+    if interval is not None and 'MUTANTS_PROFILE_INTERVAL' not in os.environ:
+        SETTINGS['interval'] = float(interval)
+
+
+def _sampled():
+    return SETTINGS['dir'] and random.random() < SETTINGS['rate']
+
+
+def _frame_name(frame):
+    code = frame.f_code
+    return f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})'
+
+
+class Session:
+    # cProfile for a pstats file plus a stack sampler for flamegraph-ready collapsed stacks.
+    # cProfile only sees the thread that started the session; the sampler walks every thread so
+    # dispatcher and run_in_executor work shows up in the collapsed stacks, rooted at the thread's name
+    def __init__(self, name):
+        import cProfile
+        self.name = name
+        self.profile = cProfile.Profile()
+        self.stacks = collections.Counter()
+        self._thread = threading.get_ident()
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._sample, name='profile-sampler', daemon=True)
+
+
+    def _sample(self):
+        while not self._stop.wait(SETTINGS['interval']):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == self._sampler.ident:
+                    continue
+                # parked pool workers sit in threading/queue waits, only the profiled thread's waits count
+                if ident != self._thread and os.path.basename(frame.f_code.co_filename) in IDLE_FILES:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_name(frame))
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self.stacks[';'.join(reversed(stack))] += 1
+
+
+    def start(self):
+        self._sampler.start()
+        self.profile.enable()
+
+
+    def stop(self):
+        self.profile.disable()
+        self._stop.set()
+        self._sampler.join()
+        self.write()
+
+
+    def write(self):
+        os.makedirs(SETTINGS['dir'], exist_ok=True)
+        _seq[self.name] += 1
+        base = os.path.join(SETTINGS['dir'], f'{self.name}-{int(time.time())}-{os.getpid()}-{_seq[self.name]}')
+        self.profile.dump_stats(base + '.pstats')
+        with open(base + '.collapsed', 'w') as f:
+            for stack, count in self.stacks.items():
+                f.write(f'{stack} {count}\n')
+
+
+def _begin(name):
+    # one session at a time, overlapping invocations (bot coroutines) run unprofiled
+    if not _sampled() or not _active.acquire(blocking=False):
+        return None
+    session = Session(name)
+    session.start()
+    return session
+
+
+def _end(session):
+    try:
+        session.stop()
+    finally:
+        _active.release()
+
+
+def profiled(name):
+    # wraps a handler, sync or async; a no-op unless profiling is enabled and the invocation is sampled.
+    # an async profile covers the whole event loop thread while the handler is awaited
+    def decorator(fn):
+        if fn.__code__.co_flags & CO_COROUTINE:
+            @functools.wraps(fn)
+            async def wrapper(*args, **kwargs):
+                session = _begin(name)
+                try:
+                    return await fn(*args, **kwargs)
+                finally:
+                    if session:
+                        _end(session)
+        else:
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                session = _begin(name)
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    if session:
+                        _end(session)
+        return wrapper
+    return decorator
@@ -0,0 +1,92 @@
+import sys
+import time
+from mutants import CLIENTS, load_config
+from storage import INDEXES, INDEX_ATTRS
+
+
+def index(attr):
+    return {
+        'IndexName': INDEXES[attr],
+        'KeySchema': [
+            {'AttributeName': attr, 'KeyType': 'HASH'},
+            {'AttributeName': 'expires', 'KeyType': 'RANGE'}
+        ],
+        # keys are projected anyway, dynamodb rejects them in NonKeyAttributes
+        'Projection': {'ProjectionType': 'INCLUDE',
+                       'NonKeyAttributes': [a for a in INDEX_ATTRS if a not in ('lobbyId', attr, 'expires')]}
+    }
+
+
+ATTRIBUTES = [
+    {'AttributeName': 'lobbyId', 'AttributeType': 'S'},
+    {'AttributeName': 'active', 'AttributeType': 'S'},
+    {'AttributeName': 'creator', 'AttributeType': 'S'},
+    {'AttributeName': 'expires', 'AttributeType': 'N'},
+]
+
+
+def create_table(db, name):
+    client = db.meta.client
+    if name in client.list_tables()['TableNames']:
+        print(f'{name} exists')
+        return
+    client.create_table(
+        TableName=name,
+        BillingMode='PAY_PER_REQUEST',
+        KeySchema=[{'AttributeName': 'lobbyId', 'KeyType': 'HASH'}],
+        AttributeDefinitions=ATTRIBUTES,
+        GlobalSecondaryIndexes=[index(attr) for attr in INDEXES]
+    )
+    client.get_waiter('table_exists').wait(TableName=name)
+    print(f'{name} created')
+
+
+def create_indexes(db, name):
+    # tables created before the indexes existed, dynamodb only adds one gsi per update
+    client = db.meta.client
+    existing = {i['IndexName'] for i in client.describe_table(TableName=name)['Table'].get('GlobalSecondaryIndexes', [])}
+    for attr, indexName in INDEXES.items():
+        if indexName in existing:
+            continue
+        client.update_table(
+            TableName=name,
+            AttributeDefinitions=ATTRIBUTES,
+            GlobalSecondaryIndexUpdates=[{'Create': index(attr)}]
+        )
+        print(f'{name} index {indexName} creating')
+        wait_for_indexes(client, name)
+
+
+def wait_for_indexes(client, name):
+    while any(i['IndexStatus'] != 'ACTIVE'
+              for i in client.describe_table(TableName=name)['Table'].get('GlobalSecondaryIndexes', [])):
+        time.sleep(10)
+
+
+def enable_ttl(db, name):
+    # lobbies and their slot records carry an epoch 'expires', dynamodb deletes them after it passes
+    client = db.meta.client
+    ttl = client.describe_time_to_live(TableName=name)['TimeToLiveDescription']
+    if ttl.get('TimeToLiveStatus') in ('ENABLED', 'ENABLING') and ttl.get('AttributeName') == 'expires':
+        print(f'{name} ttl on expires already {ttl["TimeToLiveStatus"].lower()}')
+        return
+    client.update_time_to_live(
+        TableName=name,
+        TimeToLiveSpecification={'Enabled': True, 'AttributeName': 'expires'}
+    )
+    print(f'{name} ttl on expires enabled')
+
+
+def main():
+    cfg = load_config(sys.argv[1] if len(sys.argv) > 1 else None)
+    if cfg.get('STORAGE', 'dynamodb') != 'dynamodb':
+        print(f'STORAGE is {cfg["STORAGE"]}, nothing to provision')
+        return
+    db = CLIENTS.dynamodb(cfg.get('REGION', 'us-west-2'))
+    create_table(db, cfg['TABLE'])
+    create_indexes(db, cfg['TABLE'])
+    enable_ttl(db, cfg['TABLE'])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,353 @@
+import copy
+import json
+import threading
+from contextlib import contextmanager
+
+
+class ConditionFailed(Exception):
+    # a conditional write was rejected, item is the lobby as it was (None if missing)
+    def __init__(self, item=None):
+        self.item = item
+
+
+def can_join(item, user, member, now):
+    # mirrors DynamoStorage.join's condition expression for the local backends
+    return (item is not None and
+            item.get('expires', now + 1) > now and
+            user not in item['joined'] and
+            len(item['joined']) < item['max'] and
+            (member or item.get('public') is True))
+
+
+def assign(item, attr, value):
+    # the local backends' side of DynamoStorage.swap, None removes the attribute
+    if value is None:
+        item.pop(attr, None)
+    else:
+        item[attr] = value
+
+
+def project(item, attrs):
+    if item is None or attrs is None:
+        return item
+    return {k: v for k, v in item.items() if k in attrs}
+
+
+# sparse GSIs over live lobbies, slot records carry neither 'active' nor 'creator'
+INDEXES = {
+    'active': 'active-expires',
+    'creator': 'creator-expires',
+}
+INDEX_ATTRS = ('lobbyId', 'name', 'joined', 'max', 'public', 'creator', 'expires')
+
+
+def slot_key(lobbyId, slotId):
+    # slot records share the table with lobbies, '#' never appears in a lobby id
+    return f'{lobbyId}#{slotId}'
+
+
+class DynamoStorage:
+    def __init__(self, table):
+        self.table = table
+        self._deserializer = None
+
+
+    def _deserialize(self, item):
+        if self._deserializer is None:
+            from boto3.dynamodb.types import TypeDeserializer
+            self._deserializer = TypeDeserializer()
+        return {k: self._deserializer.deserialize(v) for k, v in item.items()}
+
+
+    def get(self, lobbyId, attrs=None, consistent=True):
+        kwargs = {'Key': {'lobbyId': lobbyId}, 'ConsistentRead': consistent}
+        if attrs:
+            # max, name and public are reserved words, alias every attribute
+            kwargs['ProjectionExpression'] = ', '.join(f'#p{i}' for i in range(len(attrs)))
+            kwargs['ExpressionAttributeNames'] = {f'#p{i}': attr for i, attr in enumerate(attrs)}
+        return self.table.get_item(**kwargs).get('Item')
+
+
+    def put(self, item, new=False):
+        if not new:
+            self.table.put_item(Item=item)
+            return
+        try:
+            self.table.put_item(Item=item, ConditionExpression='attribute_not_exists(lobbyId)')
+        except self.table.meta.client.exceptions.ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                raise
+            raise ConditionFailed()
+
+
+    def put_many(self, items):
+        with self.table.batch_writer() as batch:
+            for item in items:
+                batch.put_item(Item=item)
+
+
+    def update(self, lobbyId, fields):
+        self.table.update_item(
+            Key={'lobbyId': lobbyId},
+            UpdateExpression='SET ' + ', '.join(f'#{f} = :{f}' for f in fields),
+            ExpressionAttributeNames={f'#{f}': f for f in fields},
+            ExpressionAttributeValues={f':{f}': v for f, v in fields.items()}
+        )
+
+
+    def join(self, lobbyId, user, member, now, lease=None):
+        # ttl deletion lags by up to a couple of days, expired lobbies are rejected here too,
+        # lease is set as 'announce' unless another join already holds it
+        condition = ('attribute_exists(lobbyId) AND #expires > :now AND '
+                     'NOT contains(joined, :user) AND size(joined) < #max')
+        update = 'SET joined = list_append(joined, :users)'
+        names = {'#max': 'max', '#expires': 'expires'}
+        values = {':user': user, ':users': [user], ':now': now}
+        if lease:
+            update += ', #announce = if_not_exists(#announce, :lease)'
+            names['#announce'] = 'announce'
+            values[':lease'] = lease
+        if not member:
+            condition += ' AND #public = :true'
+            names['#public'] = 'public'
+            values[':true'] = True
+        try:
+            r = self.table.update_item(
+                Key={'lobbyId': lobbyId},
+                UpdateExpression=update,
+                ConditionExpression=condition,
+                ExpressionAttributeNames=names,
+                ExpressionAttributeValues=values,
+                ReturnValues='ALL_NEW',
+                ReturnValuesOnConditionCheckFailure='ALL_OLD'
+            )
+        except self.table.meta.client.exceptions.ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                raise
+            item = e.response.get('Item')
+            raise ConditionFailed(self._deserialize(item) if item else None)
+        return r['Attributes']
+
+
+    def swap(self, lobbyId, attr, expected, value):
+        # compare-and-set of one attribute (None is absent), returns the item as written
+        names = {'#a': attr}
+        values = {}
+        if expected is None:
+            condition = 'attribute_exists(lobbyId) AND attribute_not_exists(#a)'
+        else:
+            condition = '#a = :expected'
+            values[':expected'] = expected
+        if value is None:
+            update = 'REMOVE #a'
+        else:
+            update = 'SET #a = :value'
+            values[':value'] = value
+        kwargs = {
+            'Key': {'lobbyId': lobbyId},
+            'UpdateExpression': update,
+            'ConditionExpression': condition,
+            'ExpressionAttributeNames': names,
+            'ReturnValues': 'ALL_NEW',
+        }
+        if values:
+            kwargs['ExpressionAttributeValues'] = values
+        try:
+            r = self.table.update_item(**kwargs)
+        except self.table.meta.client.exceptions.ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                raise
+            raise ConditionFailed()
+        return r['Attributes']
+
+
+    def query(self, attr, value, after):
+        # lobbies with attr == value expiring after 'after', soonest first, one paginated index query
+        kwargs = {
+            'IndexName': INDEXES[attr],
+            'KeyConditionExpression': '#k = :v AND #expires > :after',
+            'ExpressionAttributeNames': {'#k': attr, '#expires': 'expires'},
+            'ExpressionAttributeValues': {':v': value, ':after': after},
+        }
+        while True:
+            r = self.table.query(**kwargs)
+            yield from r['Items']
+            if 'LastEvaluatedKey' not in r:
+                return
+            kwargs['ExclusiveStartKey'] = r['LastEvaluatedKey']
+
+
+    def list(self):
+        kwargs = {'FilterExpression': 'attribute_exists(joined)'}
+        while True:
+            r = self.table.scan(**kwargs)
+            yield from r['Items']
+            if 'LastEvaluatedKey' not in r:
+                return
+            kwargs['ExclusiveStartKey'] = r['LastEvaluatedKey']
+
+
+class MemoryStorage:
+    # process-local stand-in for offline runs and benchmarks
+    def __init__(self):
+        self._items = {}
+        self._lock = threading.Lock()
+
+
+    def get(self, lobbyId, attrs=None, consistent=True):
+        with self._lock:
+            return copy.deepcopy(project(self._items.get(lobbyId), attrs))
+
+
+    def put(self, item, new=False):
+        with self._lock:
+            if new and item['lobbyId'] in self._items:
+                raise ConditionFailed()
+            self._items[item['lobbyId']] = copy.deepcopy(item)
+
+
+    def put_many(self, items):
+        with self._lock:
+            for item in items:
+                self._items[item['lobbyId']] = copy.deepcopy(item)
+
+
+    def update(self, lobbyId, fields):
+        with self._lock:
+            self._items.setdefault(lobbyId, {'lobbyId': lobbyId}).update(copy.deepcopy(fields))
+
+
+    def join(self, lobbyId, user, member, now, lease=None):
+        with self._lock:
+            item = self._items.get(lobbyId)
+            if not can_join(item, user, member, now):
+                raise ConditionFailed(copy.deepcopy(item))
+            item['joined'] = item['joined'] + [user]
+            if lease:
+                item.setdefault('announce', lease)
+            return copy.deepcopy(item)
+
+
+    def swap(self, lobbyId, attr, expected, value):
+        with self._lock:
+            item = self._items.get(lobbyId)
+            if item is None or item.get(attr) != expected:
+                raise ConditionFailed(copy.deepcopy(item))
+            assign(item, attr, value)
+            return copy.deepcopy(item)
+
+
+    def query(self, attr, value, after):
+        with self._lock:
+            items = [item for item in self._items.values() if item.get(attr) == value and item['expires'] > after]
+            return copy.deepcopy(sorted(items, key=lambda item: item['expires']))
+
+
+    def list(self):
+        with self._lock:
+            return copy.deepcopy([item for item in self._items.values() if 'joined' in item])
+
+
+class SqliteStorage:
+    # single-file stand-in, items are stored as json documents
+    def __init__(self, path='lobbies.db'):
+        import sqlite3
+        self._integrity_error = sqlite3.IntegrityError
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute('CREATE TABLE IF NOT EXISTS lobbies (lobbyId TEXT PRIMARY KEY, item TEXT NOT NULL)')
+        self._lock = threading.Lock()
+
+
+    @contextmanager
+    def _transaction(self):
+        # a failed batch or update is rolled back, never committed half applied
+        self._db.execute('BEGIN IMMEDIATE')
+        try:
+            yield
+        except BaseException:
+            self._db.execute('ROLLBACK')
+            raise
+        self._db.execute('COMMIT')
+
+
+    def _get(self, lobbyId):
+        row = self._db.execute('SELECT item FROM lobbies WHERE lobbyId = ?', (lobbyId,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+
+    def _put(self, item, new=False):
+        verb = 'INSERT' if new else 'INSERT OR REPLACE'
+        self._db.execute(f'{verb} INTO lobbies (lobbyId, item) VALUES (?, ?)', (item['lobbyId'], json.dumps(item)))
+
+
+    def get(self, lobbyId, attrs=None, consistent=True):
+        with self._lock:
+            return project(self._get(lobbyId), attrs)
+
+
+    def put(self, item, new=False):
+        with self._lock:
+            try:
+                self._put(item, new)
+            except self._integrity_error:
+                raise ConditionFailed()
+
+
+    def put_many(self, items):
+        with self._lock, self._transaction():
+            for item in items:
+                self._put(item)
+
+
+    def update(self, lobbyId, fields):
+        with self._lock, self._transaction():
+            item = self._get(lobbyId) or {'lobbyId': lobbyId}
+            item.update(fields)
+            self._put(item)
+
+
+    def join(self, lobbyId, user, member, now, lease=None):
+        with self._lock, self._transaction():
+            item = self._get(lobbyId)
+            if not can_join(item, user, member, now):
+                raise ConditionFailed(item)
+            item['joined'].append(user)
+            if lease:
+                item.setdefault('announce', lease)
+            self._put(item)
+            return item
+
+
+    def swap(self, lobbyId, attr, expected, value):
+        with self._lock, self._transaction():
+            item = self._get(lobbyId)
+            if item is None or item.get(attr) != expected:
+                raise ConditionFailed(item)
+            assign(item, attr, value)
+            self._put(item)
+            return item
+
+
+    def query(self, attr, value, after):
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT item FROM lobbies WHERE json_extract(item, ?) = ? AND json_extract(item, '$.expires') > ? "
+                "ORDER BY json_extract(item, '$.expires')", ('$.' + attr, value, after))
+            return [json.loads(row[0]) for row in rows]
+
+
+    def list(self):
+        with self._lock:
+            items = (json.loads(row[0]) for row in self._db.execute('SELECT item FROM lobbies'))
+            return [item for item in items if 'joined' in item]
+
+
+def connect(config, clients):
+    kind = config.get('STORAGE', 'dynamodb')
+    if kind == 'memory':
+        return MemoryStorage()
+    elif kind == 'sqlite':
+        return SqliteStorage(config.get('STORAGE_PATH', 'lobbies.db'))
+    elif kind == 'dynamodb':
+        return DynamoStorage(clients.table(config['TABLE'], config.get('REGION', 'us-west-2')))
+    raise ValueError(f'Unknown STORAGE: {kind}')
@@ -0,0 +1,79 @@
+import os
+import time
+
+import pytest
+
+import bench
+import lambda_function
+from mutants import CLIENTS, DISPATCHER, Lobby, load_config
+
+
+@pytest.fixture
+def lobby_env():
+    # bench's in-memory stand-ins, every telegram edit's text recorded in order
+    raw = bench.make_config(users=3, channels=1, webhooks=0)
+    raw['COALESCE_SECS'] = 3
+    path = bench.write_config(raw)
+    cfg = load_config()
+    stubs = bench.install(cfg)
+    edits = []
+    edit = stubs.telegram.edit_message_text
+
+    def record(text, chat_id, message_id, **kwargs):
+        edits.append(text)
+        return edit(text, chat_id, message_id, **kwargs)
+
+    stubs.telegram.edit_message_text = record
+    lobby = Lobby(cfg).new(creator=next(iter(cfg.users)), joined=[], max=len(cfg.users))
+    DISPATCHER.drain()
+    yield cfg, lobby, edits
+    DISPATCHER.max_delay = None
+    DISPATCHER.drain()
+    os.unlink(path)
+    del os.environ['MUTANTS_CONFIG']
+
+
+def stored(cfg, lobby):
+    return CLIENTS.storage(cfg).get(lobby.lobbyId)
+
+
+def test_stale_lease_is_taken_over(lobby_env):
+    cfg, lobby, edits = lobby_env
+    cfg['COALESCE_SECS'] = 0
+    # a holder that never released, e.g. a lambda container frozen before its flush
+    stale = f'{int((time.time() - 60) * 1000)}:deadbeef'
+    CLIENTS.storage(cfg).swap(lobby.lobbyId, 'announce', None, stale)
+    slotId, user = next((s, u) for s, u in lobby.slots.items() if u != lobby.creator)
+    Lobby.from_item(cfg, {'lobbyId': lobby.lobbyId}).join(user)
+    DISPATCHER.drain()
+    item = stored(cfg, lobby)
+    assert item.get('announce') is None
+    assert edits and edits[-1].startswith(f'{lobby.name} (2/3)')
+
+
+def test_fresh_lease_holder_announces_for_everyone(lobby_env):
+    cfg, lobby, edits = lobby_env
+    cfg['COALESCE_SECS'] = 0
+    CLIENTS.storage(cfg).swap(lobby.lobbyId, 'announce', None, f'{int(time.time() * 1000)}:held')
+    slotId, user = next((s, u) for s, u in lobby.slots.items() if u != lobby.creator)
+    Lobby.from_item(cfg, {'lobbyId': lobby.lobbyId}).join(user)
+    DISPATCHER.drain()
+    # still within the holder's window, its flush will carry this join
+    assert edits == []
+    assert stored(cfg, lobby)['announce'].endswith(':held')
+
+
+def test_lambda_join_that_fills_the_lobby_is_announced(lobby_env):
+    cfg, lobby, edits = lobby_env
+    for slotId, user in lobby.slots.items():
+        if user == lobby.creator:
+            continue
+        start = time.perf_counter()
+        r = lambda_function.lambda_handler({'headers': {'user-agent': 'pytest'}, 'path': f'/{lobby.lobbyId}/{slotId}/join'}, None)
+        # COALESCE_SECS is 3, the response must not wait it out
+        assert r['statusCode'] == 200 and r['body'].endswith(' joined the lobby.')
+        assert time.perf_counter() - start < lambda_function.DRAIN_SECS
+    item = stored(cfg, lobby)
+    assert len(item['joined']) == item['max']
+    assert item.get('announce') is None
+    assert edits[-1].startswith(f'{lobby.name} (3/3)')